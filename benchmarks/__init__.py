@@ -0,0 +1,3 @@
+"""
+Benchmarks hors ligne des cogs (sans connexion Discord)
+"""
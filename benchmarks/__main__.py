@@ -0,0 +1,43 @@
+"""
+Lance les benchmarks hors ligne et compare avec le dernier résultat enregistré
+
+Usage :
+    python -m benchmarks                      # tous les scénarios
+    python -m benchmarks reunions_rappels --reunions 1000
+    python -m benchmarks budget_graphique --transactions 5000 --iterations 5
+"""
+import argparse
+import asyncio
+
+from benchmarks.outils import afficher, enregistrer, precedent
+from benchmarks.scenarios import SCENARIOS
+
+
+def lire_arguments():
+    parser = argparse.ArgumentParser(description="Benchmarks hors ligne des cogs")
+    parser.add_argument("scenarios", nargs="*",
+                        help=f"Scénarios à lancer (tous par défaut) : {', '.join(SCENARIOS)}")
+    parser.add_argument("--membres", type=int, default=10_000, help="Membres connus (Statistiques)")
+    parser.add_argument("--reunions", type=int, default=200, help="Réunions stockées")
+    parser.add_argument("--transactions", type=int, default=1_000, help="Transactions du budget")
+    parser.add_argument("--iterations", type=int, help="Itérations (sinon valeur par scénario)")
+    parser.add_argument("--sans-memoire", action="store_true", help="Ne pas mesurer la mémoire de pointe")
+    parser.add_argument("--sans-enregistrement", action="store_true", help="Ne pas ajouter à l'historique")
+    args = parser.parse_args()
+    inconnus = [nom for nom in args.scenarios if nom not in SCENARIOS]
+    if inconnus:
+        parser.error(f"scénario(s) inconnu(s) : {', '.join(inconnus)}")
+    return args
+
+
+async def executer(args):
+    for nom in args.scenarios or SCENARIOS:
+        scenario, iterations = SCENARIOS[nom]
+        resultat = await scenario(args, args.iterations or iterations, not args.sans_memoire)
+        afficher(resultat, precedent(resultat))
+        if not args.sans_enregistrement:
+            enregistrer(resultat)
+
+
+if __name__ == "__main__":
+    asyncio.run(executer(lire_arguments()))
@@ -0,0 +1,251 @@
+"""
+Outils communs des benchmarks : faux bot Discord, mesures et historique des résultats
+"""
+import asyncio
+import json
+import os
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from types import SimpleNamespace
+
+# La configuration lit des IDs de salons obligatoires : valeurs factices hors ligne
+for variable in ("CHANNEL_REGLES", "CHANNEL_IDEES", "GUILD_ID", "CHANNEL_ORGANIGRAMME"):
+    os.environ.setdefault(variable, "0")
+
+from utils.moniteur import percentile
+from utils.stockage import Stockage
+
+DOSSIER_RESULTATS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resultats")
+HISTORIQUE = os.path.join(DOSSIER_RESULTATS, "historique.jsonl")
+
+GUILD_ID = 42
+CHANNEL_ID = 7
+BOT_ID = 1
+
+
+# ========================================
+# 🤖 FAUX OBJETS DISCORD
+# ========================================
+
+class FauxSalon:
+    def __init__(self, salon_id=CHANNEL_ID):
+        self.id = salon_id
+        self.envois = 0
+        self.editions = 0
+
+    async def send(self, content=None, **kwargs):
+        self.envois += 1
+        return SimpleNamespace(id=self.envois, content=content, **kwargs)
+
+    def get_partial_message(self, message_id):
+        return FauxMessage(self, message_id)
+
+
+class FauxMessage:
+    def __init__(self, salon, message_id):
+        self.salon = salon
+        self.id = message_id
+
+    async def edit(self, **kwargs):
+        self.salon.editions += 1
+
+
+class FauxMembre:
+    def __init__(self, membre_id, bot=False):
+        self.id = membre_id
+        self.bot = bot
+        self.name = f"membre{membre_id}"
+        self.display_name = self.name
+        self.mention = f"<@{membre_id}>"
+        self.mp = 0
+
+    async def send(self, content=None, **kwargs):
+        self.mp += 1
+
+
+class FauxServeur:
+    def __init__(self, guild_id=GUILD_ID):
+        self.id = guild_id
+        self.salons = {CHANNEL_ID: FauxSalon()}
+        self.membres = {}
+
+    def get_channel(self, salon_id):
+        return self.salons.get(salon_id)
+
+    def get_member(self, membre_id):
+        if membre_id not in self.membres:
+            self.membres[membre_id] = FauxMembre(membre_id)
+        return self.membres[membre_id]
+
+
+class FauxBot:
+    """Le strict nécessaire de AssistantBot pour instancier et faire tourner un cog"""
+
+    def __init__(self, dossier):
+        self.user = FauxMembre(BOT_ID, bot=True)
+        self.stockage = Stockage(os.path.join(dossier, "bench.db"))
+        self.serveur = FauxServeur()
+        self._pret = asyncio.Event()  # Jamais prêt : les tâches.loop restent en attente
+
+    def get_guild(self, guild_id):
+        return self.serveur if guild_id == self.serveur.id else None
+
+    def get_channel(self, salon_id):
+        return self.serveur.get_channel(salon_id)
+
+    def get_user(self, user_id):
+        return self.serveur.get_member(user_id)
+
+    async def wait_until_ready(self):
+        await self._pret.wait()
+
+    def close(self):
+        self.stockage.close()
+
+
+class Contexte:
+    """Bot + cog instanciés pour un scénario, avec les données générées"""
+
+    def __init__(self, bot, cog, **donnees):
+        self.bot = bot
+        self.cog = cog
+        self.__dict__.update(donnees)
+
+    async def fermer(self):
+        # Arrête les tâches.loop du cog (et écrit ses données en attente)
+        dechargement = getattr(self.cog, "cog_unload", None)
+        if dechargement:
+            resultat = dechargement()
+            if asyncio.iscoroutine(resultat):
+                await resultat
+        self.bot.close()
+
+
+def faux_message(auteur_id, contenu="Bonjour !"):
+    return SimpleNamespace(
+        author=FauxMembre(auteur_id),
+        content=contenu,
+        guild=SimpleNamespace(id=GUILD_ID),
+        channel=SimpleNamespace(id=CHANNEL_ID)
+    )
+
+
+def fausse_reaction(user_id, message_id, emoji="👍", guild_id=GUILD_ID):
+    return SimpleNamespace(
+        user_id=user_id,
+        message_id=message_id,
+        guild_id=guild_id,
+        channel_id=CHANNEL_ID,
+        member=FauxMembre(user_id),
+        emoji=emoji
+    )
+
+
+def dossier_temporaire():
+    return tempfile.TemporaryDirectory(prefix="bench-")
+
+
+# ========================================
+# ⏱️ MESURES
+# ========================================
+
+async def mesurer(nom, preparer, operation, iterations, parametres, memoire=True):
+    """
+    Exécute `operation(contexte, i)` `iterations` fois sur un contexte créé par
+    `preparer(dossier)` (coroutine) et retourne débit, percentiles et mémoire.
+    La mémoire de pointe est mesurée dans une seconde exécution sous tracemalloc,
+    pour ne pas fausser les latences.
+    """
+    with dossier_temporaire() as dossier:
+        contexte = await preparer(dossier)
+        try:
+            latences = []
+            debut_total = time.perf_counter()
+            for i in range(iterations):
+                debut = time.perf_counter()
+                resultat = operation(contexte, i)
+                if asyncio.iscoroutine(resultat):
+                    await resultat
+                latences.append(time.perf_counter() - debut)
+            duree = time.perf_counter() - debut_total
+        finally:
+            await contexte.fermer()
+
+    pic_memoire = None
+    if memoire:
+        with dossier_temporaire() as dossier:
+            tracemalloc.start()
+            contexte = await preparer(dossier)
+            try:
+                for i in range(iterations):
+                    resultat = operation(contexte, i)
+                    if asyncio.iscoroutine(resultat):
+                        await resultat
+                pic_memoire = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+                await contexte.fermer()
+
+    return {
+        "scenario": nom,
+        "parametres": parametres,
+        "iterations": iterations,
+        "ops_par_seconde": iterations / duree if duree else 0.0,
+        "p50_ms": percentile(latences, 50) * 1000,
+        "p95_ms": percentile(latences, 95) * 1000,
+        "p99_ms": percentile(latences, 99) * 1000,
+        "max_ms": max(latences, default=0.0) * 1000,
+        "pic_memoire_mo": None if pic_memoire is None else pic_memoire / 1e6,
+    }
+
+
+# ========================================
+# 📁 HISTORIQUE
+# ========================================
+
+def version_courante():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "inconnue"
+
+
+def precedent(resultat):
+    """Dernier résultat enregistré pour le même scénario et les mêmes paramètres"""
+    if not os.path.exists(HISTORIQUE):
+        return None
+    dernier = None
+    with open(HISTORIQUE, 'r', encoding='utf-8') as f:
+        for ligne in f:
+            ancien = json.loads(ligne)
+            if ancien["scenario"] == resultat["scenario"] and ancien["parametres"] == resultat["parametres"]:
+                dernier = ancien
+    return dernier
+
+
+def enregistrer(resultat):
+    os.makedirs(DOSSIER_RESULTATS, exist_ok=True)
+    ligne = dict(resultat, version=version_courante(), date=datetime.now().isoformat())
+    with open(HISTORIQUE, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(ligne, ensure_ascii=False) + "\n")
+
+
+def afficher(resultat, ancien=None):
+    print(f"📊 {resultat['scenario']} {resultat['parametres']}")
+    evolution = ""
+    if ancien:
+        ecart = (resultat["ops_par_seconde"] / ancien["ops_par_seconde"] - 1) * 100
+        evolution = f" ({ecart:+.1f} % vs {ancien.get('version', '?')})"
+    print(f"  ⚡ {resultat['ops_par_seconde']:,.0f} ops/s{evolution}")
+    print(
+        f"  ⏱️ p50 {resultat['p50_ms']:.3f} ms • p95 {resultat['p95_ms']:.3f} ms • "
+        f"p99 {resultat['p99_ms']:.3f} ms • max {resultat['max_ms']:.3f} ms"
+    )
+    if resultat["pic_memoire_mo"] is not None:
+        print(f"  🧠 Mémoire de pointe : {resultat['pic_memoire_mo']:.1f} Mo")
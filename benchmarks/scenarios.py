@@ -0,0 +1,288 @@
+"""
+Scénarios de benchmark des chemins chauds des cogs
+"""
+import random
+from datetime import datetime, timedelta
+
+from benchmarks.outils import (
+    Contexte, FauxBot, GUILD_ID, CHANNEL_ID, faux_message, fausse_reaction, mesurer
+)
+
+PREMIER_MEMBRE = 10 ** 17
+PREMIER_MESSAGE = 10 ** 18
+
+
+def fausse_reunion(numero, date, invites):
+    """Réunion au format stocké par /reunion"""
+    return {
+        'id': numero,
+        'message_id': PREMIER_MESSAGE + numero,
+        'guild_id': GUILD_ID,
+        'channel_id': CHANNEL_ID,
+        'organisateur_id': invites[0],
+        'organisateur_name': f"membre{invites[0]}",
+        'date': date.isoformat(),
+        'titre': f"Réunion {numero}",
+        'sujet': "Ordre du jour",
+        'participants_invites': list(invites),
+        'participants_confirmes': [],
+        'participants_absents': [],
+        'rappel_30min_envoye': False,
+        'rappel_5min_envoye': False,
+        'rappel_debut_envoye': False,
+        'created_at': datetime.now().isoformat()
+    }
+
+
+def generer_reunions(nombre, invites_par_reunion=20):
+    """Réunions réparties sur les 30 prochains jours (quelques-unes imminentes)"""
+    maintenant = datetime.now()
+    reunions = []
+    for numero in range(1, nombre + 1):
+        date = maintenant + timedelta(minutes=random.randint(1, 30 * 24 * 60))
+        invites = random.sample(range(PREMIER_MEMBRE, PREMIER_MEMBRE + 10 * invites_par_reunion), invites_par_reunion)
+        reunions.append(fausse_reunion(numero, date, invites))
+    return reunions
+
+
+# ========================================
+# 📊 STATISTIQUES
+# ========================================
+
+async def statistiques_message(args, iterations, memoire=True):
+    """Statistiques.on_message sur un serveur de `membres` membres"""
+    from cogs.statistiques import Statistiques
+
+    async def preparer(dossier):
+        bot = FauxBot(dossier)
+        cog = Statistiques(bot)
+        await cog.cog_load()
+        for i in range(args.membres):
+            cog.membres.definir(PREMIER_MEMBRE + i, {"messages": random.randint(0, 5000)})
+        cog.classements = cog.construire_classements()
+        messages = [
+            faux_message(PREMIER_MEMBRE + random.randrange(args.membres))
+            for _ in range(iterations)
+        ]
+        return Contexte(bot, cog, messages=messages)
+
+    return await mesurer(
+        "statistiques_message", preparer,
+        lambda ctx, i: ctx.cog.on_message(ctx.messages[i]),
+        iterations, {"membres": args.membres}, memoire
+    )
+
+
+async def statistiques_reactions(args, iterations, memoire=True):
+    """Rafale de réactions sur un message populaire (10 % de retraits)"""
+    from cogs.statistiques import Statistiques
+
+    async def preparer(dossier):
+        bot = FauxBot(dossier)
+        cog = Statistiques(bot)
+        await cog.cog_load()
+        evenements = [
+            (fausse_reaction(PREMIER_MEMBRE + random.randrange(args.membres), PREMIER_MESSAGE),
+             random.random() < 0.1)
+            for _ in range(iterations)
+        ]
+        return Contexte(bot, cog, evenements=evenements)
+
+    def reagir(ctx, i):
+        payload, retrait = ctx.evenements[i]
+        if retrait:
+            return ctx.cog.on_raw_reaction_remove(payload)
+        return ctx.cog.on_raw_reaction_add(payload)
+
+    return await mesurer(
+        "statistiques_reactions", preparer, reagir,
+        iterations, {"membres": args.membres}, memoire
+    )
+
+
+# ========================================
+# 📅 RÉUNIONS
+# ========================================
+
+async def preparer_reunions(dossier, args):
+    from cogs.reunions import Reunions
+    from utils.reunion import Reunion
+
+    bot = FauxBot(dossier)
+    cog = Reunions(bot)
+    await cog.cog_load()
+    for reunion in generer_reunions(args.reunions):
+        cog.ajouter_reunion(Reunion.from_dict(reunion))
+    return bot, cog
+
+
+async def reunions_reaction(args, iterations, memoire=True):
+    """Reunions.on_raw_reaction_add : ✅/❌ d'invités sur des réunions au hasard"""
+    async def preparer(dossier):
+        bot, cog = await preparer_reunions(dossier, args)
+        reunions = list(cog.reunions)
+        payloads = []
+        for _ in range(iterations):
+            reunion = random.choice(reunions)
+            payloads.append(fausse_reaction(
+                random.choice(list(reunion.invites)),
+                reunion.message_id,
+                emoji=random.choice(["✅", "❌"])
+            ))
+        return Contexte(bot, cog, payloads=payloads)
+
+    return await mesurer(
+        "reunions_reaction", preparer,
+        lambda ctx, i: ctx.cog.on_raw_reaction_add(ctx.payloads[i]),
+        iterations, {"reunions": args.reunions}, memoire
+    )
+
+
+def reunions_supplementaires(args, nombre, date):
+    """Réunions à ajouter pendant la mesure (ids après celles déjà stockées)"""
+    from utils.reunion import Reunion
+
+    invites = list(range(PREMIER_MEMBRE, PREMIER_MEMBRE + 20))
+    return [
+        Reunion.from_dict(fausse_reunion(args.reunions + 1 + i, date, invites))
+        for i in range(nombre)
+    ]
+
+
+async def reunions_planification(args, iterations, memoire=True):
+    """Reunions.ajouter_reunion : armement des échéances d'une réunion dans une semaine"""
+    async def preparer(dossier):
+        bot, cog = await preparer_reunions(dossier, args)
+        nouvelles = reunions_supplementaires(args, iterations, datetime.now() + timedelta(days=7))
+        return Contexte(bot, cog, nouvelles=nouvelles)
+
+    return await mesurer(
+        "reunions_planification", preparer,
+        lambda ctx, i: ctx.cog.ajouter_reunion(ctx.nouvelles[i]),
+        iterations, {"reunions": args.reunions}, memoire
+    )
+
+
+async def reunions_rappels(args, iterations, memoire=True):
+    """
+    Passage du planificateur qui envoie un rappel : chaque itération ajoute
+    une réunion dans 20 minutes (rappel des 30 minutes déjà échu) puis
+    exécute le passage qui le traite. L'armement seul est mesuré par
+    reunions_planification.
+    """
+    async def preparer(dossier):
+        bot, cog = await preparer_reunions(dossier, args)
+        await cog.check_reminders()  # Rappels déjà échus des réunions stockées
+        dues = reunions_supplementaires(args, iterations, datetime.now() + timedelta(minutes=20))
+        return Contexte(bot, cog, dues=dues)
+
+    async def rappeler(ctx, i):
+        ctx.cog.ajouter_reunion(ctx.dues[i])
+        if not await ctx.cog.check_reminders():
+            raise RuntimeError("Aucune échéance traitée : le scénario ne mesure plus un rappel")
+
+    return await mesurer(
+        "reunions_rappels", preparer, rappeler,
+        iterations, {"reunions": args.reunions}, memoire
+    )
+
+
+# ========================================
+# 💰 BUDGET
+# ========================================
+
+def preparer_budget(args, instantane=False):
+    """Budget dont le journal contient `transactions` lignes, rechargé depuis la base"""
+    from cogs.budget import Budget
+    from utils.budget import cle_journal
+
+    async def preparer(dossier):
+        bot = FauxBot(dossier)
+        cog = Budget(bot)
+        date = datetime.now() - timedelta(days=365)
+        with bot.stockage.lot():
+            for i in range(args.transactions):
+                date += timedelta(minutes=random.randint(1, 120))
+                type_transaction = "entree" if random.random() < 0.55 else "sortie"
+                cog.db_transactions.set_differe(cle_journal(i + 1), {
+                    "date": date.isoformat(),
+                    "montant": round(random.uniform(1, 500), 2),
+                    "type": type_transaction,
+                    "description": f"Transaction {i}",
+                    "auteur": f"membre{random.randrange(20)}"
+                })
+        await bot.stockage.synchroniser()
+        await cog.cog_load()
+        if instantane:
+            with bot.stockage.lot():
+                cog.ecrire_instantane()
+            await bot.stockage.synchroniser()
+        return Contexte(bot, cog)
+
+    return preparer
+
+
+async def budget_graphique(args, iterations, memoire=True):
+    """Budget.generer_graphique sur un registre de `transactions` lignes (rendu complet)"""
+    async def generer(ctx, i):
+        ctx.cog.cache_graphiques.invalider()
+        await ctx.cog.generer_graphique()
+
+    return await mesurer(
+        "budget_graphique", preparer_budget(args), generer,
+        iterations, {"transactions": args.transactions}, memoire
+    )
+
+
+async def budget_graphique_cache(args, iterations, memoire=True):
+    """Budget.generer_graphique répété sans nouvelle transaction (cache)"""
+    return await mesurer(
+        "budget_graphique_cache", preparer_budget(args),
+        lambda ctx, i: ctx.cog.generer_graphique(),
+        iterations, {"transactions": args.transactions}, memoire
+    )
+
+
+async def budget_chargement(args, iterations, memoire=True):
+    """Budget.cog_load : dernier instantané puis fin du journal"""
+    from cogs.budget import Budget
+
+    async def charger(ctx, i):
+        await Budget(ctx.bot).cog_load()
+
+    return await mesurer(
+        "budget_chargement", preparer_budget(args, instantane=True), charger,
+        iterations, {"transactions": args.transactions}, memoire
+    )
+
+
+async def budget_rapport(args, iterations, memoire=True):
+    """rapport_periodes (par mois et par auteur) sur la copie en colonnes du registre"""
+    from utils.budget import rapport_periodes
+
+    async def preparer(dossier):
+        contexte = await preparer_budget(args)(dossier)
+        contexte.colonnes = await contexte.cog.colonnes_budget()
+        return contexte
+
+    def rapport(ctx, i):
+        rapport_periodes(ctx.colonnes.tableaux(), ctx.colonnes.noms_auteurs, "mois", "auteur", 12)
+
+    return await mesurer(
+        "budget_rapport", preparer, rapport,
+        iterations, {"transactions": args.transactions}, memoire
+    )
+
+
+# Nom → (scénario, itérations par défaut)
+SCENARIOS = {
+    "statistiques_message": (statistiques_message, 20_000),
+    "statistiques_reactions": (statistiques_reactions, 10_000),
+    "reunions_reaction": (reunions_reaction, 5_000),
+    "reunions_planification": (reunions_planification, 5_000),
+    "reunions_rappels": (reunions_rappels, 200),
+    "budget_graphique": (budget_graphique, 10),
+    "budget_graphique_cache": (budget_graphique_cache, 1_000),
+    "budget_chargement": (budget_chargement, 50),
+    "budget_rapport": (budget_rapport, 100),
+}
@@ -2,11 +2,18 @@ import discord
 from discord.ext import commands
 import os
 import asyncio
+import signal
+import time
 from dotenv import load_dotenv
+from utils.stockage import Stockage, importer_json
+import utils.budget  # Enregistre l'import de l'ancien data/budget.json
+from utils.moniteur import MoniteurBoucle
 
 # Charger les variables d'environnement
 load_dotenv()
 
+DEBUT = time.perf_counter()
+
 class AssistantBot(commands.Bot):
     def __init__(self):
         intents = discord.Intents.default()
@@ -21,6 +28,13 @@ class AssistantBot(commands.Bot):
             help_command=None
         )
 
+        # 💾 Base SQLite partagée par tous les cogs
+        # STOCKAGE_ECRITURE_SYNCHRONE=1 écrit sur la boucle (comparaison du blocage)
+        self.stockage = Stockage(
+            "data/bot.db",
+            ecriture_synchrone=os.getenv('STOCKAGE_ECRITURE_SYNCHRONE') == '1'
+        )
+
         # ✅ LISTE COMPLÈTE DES COGS (avec budget ajouté)
         self.initial_extensions = [
             'cogs.regles',
@@ -37,14 +51,23 @@ class AssistantBot(commands.Bot):
 
     async def setup_hook(self):
         """Charge les cogs au démarrage"""
+        # ⏱️ Surveillance de la boucle : lag p50/p99 et fonctions qui la bloquent
+        self.moniteur = MoniteurBoucle(
+            seuil=int(os.getenv('MONITEUR_SEUIL_MS', 200)) / 1000,
+            periode_rapport=int(os.getenv('MONITEUR_RAPPORT_MIN', 5)) * 60
+        )
+        self.moniteur.demarrer()
+
+        # Import unique des anciens fichiers data/*.json
+        for fichier in importer_json(self.stockage):
+            print(f"  📥 {fichier} importé dans la base")
+
         print("🔄 Chargement des modules...")
 
-        for extension in self.initial_extensions:
-            try:
-                await self.load_extension(extension)
-                print(f"  ✅ {extension} chargé")
-            except Exception as e:
-                print(f"  ❌ Erreur lors du chargement de {extension} : {e}")
+        # Les cogs sont indépendants : leurs lectures en base (cog_load) se chevauchent
+        debut = time.perf_counter()
+        await asyncio.gather(*(self.charger_extension(extension) for extension in self.initial_extensions))
+        print(f"📦 {len(self.extensions)}/{len(self.initial_extensions)} modules chargés en {time.perf_counter() - debut:.2f} s")
 
         # Synchroniser les commandes avec Discord
         guild_id = os.getenv('GUILD_ID')
@@ -57,21 +80,51 @@ class AssistantBot(commands.Bot):
             await self.tree.sync()
             print("🔄 Commandes synchronisées globalement")
 
+    async def charger_extension(self, extension):
+        """Charge une extension et journalise son temps de chargement"""
+        debut = time.perf_counter()
+        try:
+            await self.load_extension(extension)
+            print(f"  ✅ {extension} chargé ({(time.perf_counter() - debut) * 1000:.0f} ms)")
+        except Exception as e:
+            print(f"  ❌ Erreur lors du chargement de {extension} : {e}")
+
+    async def close(self):
+        """Décharge les cogs (sauvegardes en attente) puis ferme la base"""
+        if self.is_closed():
+            return
+        await super().close()
+        if hasattr(self, 'moniteur'):
+            self.moniteur.arreter()
+            print(self.moniteur.rapport())
+        print(f"💾 Blocage de la boucle par les écritures : {self.stockage.rapport_blocage()}")
+        self.stockage.close()
+
     async def on_ready(self):
         print("=" * 50)
         print(f"✅ Bot | {self.user} est connecté et opérationnel!")
         print(f"📊 Connecté à {len(self.guilds)} serveur(s)")
         print(f"👥 {len(self.users)} utilisateurs visibles")
+        print(f"⏱️ Prêt en {time.perf_counter() - DEBUT:.2f} s depuis le lancement")
         print("=" * 50)
 
 async def main():
     bot = AssistantBot()
 
+    # Railway arrête le conteneur avec SIGTERM : on ferme proprement le bot
+    # pour que les cogs écrivent leurs données en attente (cog_unload)
+    loop = asyncio.get_running_loop()
     try:
+        loop.add_signal_handler(signal.SIGTERM, lambda: asyncio.create_task(bot.close()))
+    except NotImplementedError:
+        pass
+
+    # La fermeture du contexte décharge les extensions, même en cas d'interruption
+    async with bot:
         await bot.start(os.getenv('DISCORD_TOKEN'))
-    except KeyboardInterrupt:
-        print("\n⚠️ Arrêt du bot...")
-        await bot.close()
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\n⚠️ Arrêt du bot...")
@@ -1,36 +1,131 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
-import json
+import asyncio
 import os
+from collections import deque
 from datetime import datetime
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
 from io import BytesIO
+from config.settings import (
+    PRECHARGEMENT_APRES_READY, GRAPHIQUES_PROCESSUS,
+    GRAPHIQUES_CACHE_TAILLE, GRAPHIQUES_CACHE_DISQUE,
+    BUDGET_INTERVALLE_INSTANTANE
+)
+from utils.archive import ArchiveMensuelle
+from utils.budget import (
+    AgregatsBudget, ColonnesBudget, REINITIALISATION, cle_journal, compacter_journal,
+    rapport_periodes, serie_soldes, transactions_archivees
+)
+from utils.graphiques import (
+    CacheGraphiques, RenduGraphiques, rendu_barres_empilees, rendu_evolution_budget
+)
+
+DPI_GRAPHIQUE = 150
+POINTS_GRAPHIQUE = 2000  # Points de la courbe du solde (au-delà, la série est réduite)
+TAILLE_HISTORIQUE = 10
+MAX_AUTEURS_RAPPORT = 3  # Colonnes d'auteurs du tableau (les autres dans « Autres »)
+
 
 class Budget(commands.Cog):
+    """
+    Le budget est un journal en ajout seul (collection `budget_transactions`,
+    clé = position complétée par des zéros, voir `cle_journal`) : une ligne par
+    transaction, et une ligne « reinitialisation » pour /budget_reset. Un
+    instantané de l'état (agrégats, dernières transactions) est écrit toutes
+    les BUDGET_INTERVALLE_INSTANTANE transactions : au démarrage, seules les
+    lignes suivantes sont rejouées. /budget_compacter archive tout le journal
+    jusqu'au dernier instantané.
+    """
+
     def __init__(self, bot):
         self.bot = bot
-        self.data_file = "data/budget.json"
-        self.budget_data = self.load_data()
+        self.db_budget = bot.stockage.collection("budget")
+        self.db_transactions = bot.stockage.collection("budget_transactions")
+        self.budget_data = self.etat_vide()
+        self.agregats = AgregatsBudget()
+        self.colonnes = None  # Copie en colonnes pour /budget_rapport, chargée au premier rapport
+        self.archive = ArchiveMensuelle(
+            os.path.join(os.path.dirname(bot.stockage.chemin), "archives", "budget")
+        )
+        self.rendu = RenduGraphiques(GRAPHIQUES_PROCESSUS)
+        self.cache_graphiques = CacheGraphiques(
+            GRAPHIQUES_CACHE_TAILLE,
+            os.path.join(os.path.dirname(bot.stockage.chemin), "cache", "graphiques")
+            if GRAPHIQUES_CACHE_DISQUE else None
+        )
+
+    @staticmethod
+    def etat_vide(position=0, version=0):
+        return {
+            "solde": 0,
+            "dernieres": deque(maxlen=TAILLE_HISTORIQUE),
+            # Incrémentée à chaque modification du registre : clé du cache des graphiques
+            "version": version,
+            "position": position,  # Dernière position écrite dans le journal
+            "debut": 0,            # Position de la dernière réinitialisation
+            "instantane": 0        # Position du dernier instantané
+        }
+
+    async def cog_load(self):
+        """Lecture de la base hors de la boucle d'événements"""
+        self.budget_data, self.agregats = await asyncio.to_thread(self.load_data)
+
+    def cog_unload(self):
+        """Arrête les processus de rendu"""
+        self.rendu.fermer()
 
     def load_data(self):
-        """Charge les données du budget depuis le fichier JSON"""
-        os.makedirs("data", exist_ok=True)
-        
-        if os.path.exists(self.data_file):
-            with open(self.data_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+        """Repart du dernier instantané et rejoue la fin du journal"""
+        instantane = self.db_budget.get("instantane")
+        if instantane:
+            budget_data = self.etat_vide(instantane["position"])
+            budget_data["dernieres"].extend(instantane["dernieres"])
+            budget_data["debut"] = instantane["debut"]
+            budget_data["instantane"] = instantane["position"]
+            agregats = AgregatsBudget.depuis_etat(instantane["agregats"])
         else:
-            return {
-                "solde": 0,
-                "transactions": []
-            }
+            budget_data = self.etat_vide()
+            agregats = AgregatsBudget()
+
+        for cle, enregistrement in self.db_transactions.items_apres(cle_journal(budget_data["position"])):
+            position = int(cle)
+            if enregistrement["type"] == REINITIALISATION:
+                budget_data["dernieres"].clear()
+                budget_data["debut"] = position
+                agregats = AgregatsBudget()
+            else:
+                budget_data["dernieres"].append(enregistrement)
+                agregats.ajouter(enregistrement)
+            budget_data["position"] = max(budget_data["position"], position)
+
+        budget_data["solde"] = self.db_budget.get("solde", 0)
+        budget_data["version"] = self.db_budget.get("version", 0)
+        return budget_data, agregats
+
+    def ecrire_instantane(self):
+        """Programme l'instantané de l'état courant (à appeler dans un lot)"""
+        self.budget_data["instantane"] = self.budget_data["position"]
+        self.db_budget.set_differe("instantane", {
+            "position": self.budget_data["position"],
+            "debut": self.budget_data["debut"],
+            "dernieres": list(self.budget_data["dernieres"]),
+            "agregats": self.agregats.etat()
+        })
 
-    def save_data(self):
-        """Sauvegarde les données du budget"""
-        with open(self.data_file, 'w', encoding='utf-8') as f:
-            json.dump(self.budget_data, f, indent=4, ensure_ascii=False)
+    def journaliser(self, enregistrement):
+        """Ajoute un enregistrement au journal avec le nouveau solde, en un seul commit"""
+        self.budget_data["position"] += 1
+        self.budget_data["version"] += 1
+        if enregistrement["type"] == REINITIALISATION:
+            self.budget_data["debut"] = self.budget_data["position"]
+        self.cache_graphiques.invalider()
+        with self.bot.stockage.lot():
+            self.db_transactions.set_differe(cle_journal(self.budget_data["position"]), enregistrement)
+            self.db_budget.set_differe("solde", self.budget_data["solde"])
+            self.db_budget.set_differe("version", self.budget_data["version"])
+            if (enregistrement["type"] == REINITIALISATION or
+                    self.budget_data["position"] - self.budget_data["instantane"] >= BUDGET_INTERVALLE_INSTANTANE):
+                self.ecrire_instantane()
 
     def ajouter_transaction(self, montant: float, type_transaction: str, description: str, auteur: str):
         """Ajoute une transaction au système"""
@@ -42,72 +137,89 @@ class Budget(commands.Cog):
             "auteur": auteur
         }
         
-        self.budget_data["transactions"].append(transaction)
+        self.budget_data["dernieres"].append(transaction)
+        self.agregats.ajouter(transaction)
+        if self.colonnes is not None:
+            self.colonnes.ajouter(transaction)
         
         if type_transaction == "entree":
             self.budget_data["solde"] += montant
         else:
             self.budget_data["solde"] -= montant
         
-        self.save_data()
-
-    def generer_graphique(self) -> BytesIO:
-        """Génère un graphique de l'évolution du budget"""
-        if not self.budget_data["transactions"]:
-            fig, ax = plt.subplots(figsize=(10, 6))
-            ax.text(0.5, 0.5, 'Aucune donnée disponible', 
-                   ha='center', va='center', fontsize=16)
-            ax.set_xlim(0, 1)
-            ax.set_ylim(0, 1)
-            ax.axis('off')
-        else:
-            dates = []
-            soldes = []
-            solde_cumul = 0
-            
-            for trans in self.budget_data["transactions"]:
-                date = datetime.fromisoformat(trans["date"])
-                dates.append(date)
-                
-                if trans["type"] == "entree":
-                    solde_cumul += trans["montant"]
-                else:
-                    solde_cumul -= trans["montant"]
-                
-                soldes.append(solde_cumul)
-            
-            fig, ax = plt.subplots(figsize=(12, 6))
-            ax.plot(dates, soldes, marker='o', linewidth=2, markersize=6, color='#5865F2')
-            ax.fill_between(dates, soldes, alpha=0.3, color='#5865F2')
-            
-            ax.set_xlabel('Date', fontsize=12, fontweight='bold')
-            ax.set_ylabel('Solde (€)', fontsize=12, fontweight='bold')
-            ax.set_title('Évolution du Budget', fontsize=14, fontweight='bold')
-            
-            ax.xaxis.set_major_formatter(mdates.DateFormatter('%d/%m'))
-            ax.xaxis.set_major_locator(mdates.AutoDateLocator())
-            
-            plt.xticks(rotation=45)
-            ax.grid(True, alpha=0.3)
-            plt.tight_layout()
-        
-        buffer = BytesIO()
-        plt.savefig(buffer, format='png', dpi=150, bbox_inches='tight')
-        buffer.seek(0)
-        plt.close()
-        
-        return buffer
+        self.journaliser(transaction)
+
+    async def generer_graphique(self) -> BytesIO:
+        """Graphique de l'évolution du budget, rendu seulement si le registre a changé"""
+        async def produire():
+            # Courbe recalculée depuis la copie en colonnes : rien n'est gardé entre deux rendus
+            colonnes = await self.colonnes_budget()
+            dates, soldes = await asyncio.to_thread(serie_soldes, colonnes.tableaux(), POINTS_GRAPHIQUE)
+            return await self.rendu.rendre(rendu_evolution_budget, dates, soldes, DPI_GRAPHIQUE)
+
+        cle = CacheGraphiques.empreinte(
+            "evolution_budget", self.budget_data["version"], {"dpi": DPI_GRAPHIQUE}
+        )
+        return BytesIO(await self.cache_graphiques.obtenir(cle, produire))
+
+    @staticmethod
+    def embed_erreur(description="Le graphique n'a pas pu être généré, réessayez dans un instant."):
+        return discord.Embed(
+            title="❌ Erreur",
+            description=description,
+            color=discord.Color.red()
+        )
+
+    def charger_colonnes(self, debut):
+        """
+        Colonnes des transactions postérieures à la dernière réinitialisation
+        (hors de la boucle) : fin du journal, complétée par l'archive si le
+        début a été compacté
+        """
+        # Journal d'abord : une ligne compactée entre les deux lectures est lue
+        # deux fois (une seule gardée), jamais perdue
+        transactions = {
+            int(cle): transaction
+            for cle, transaction in self.db_transactions.items_apres(cle_journal(debut))
+        }
+        if debut + 1 not in transactions:
+            for transaction in transactions_archivees(self.archive, debut):
+                transactions.setdefault(transaction["position"], transaction)
+        return ColonnesBudget(transactions[position] for position in sorted(transactions))
+
+    async def colonnes_budget(self) -> ColonnesBudget:
+        """Copie en colonnes du registre, lue dans la base une seule fois puis tenue à jour"""
+        while self.colonnes is None:
+            position = self.budget_data["position"]
+            await self.bot.stockage.synchroniser()
+            colonnes = await asyncio.to_thread(self.charger_colonnes, self.budget_data["debut"])
+            # Une transaction arrivée pendant la lecture n'y figure peut-être pas : on relit
+            if self.colonnes is None and self.budget_data["position"] == position:
+                self.colonnes = colonnes
+        return self.colonnes
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        """Démarre les processus de rendu (et matplotlib) une fois le bot prêt"""
+        if PRECHARGEMENT_APRES_READY:
+            await self.rendu.prechauffer()
 
     @app_commands.command(name="budget_voir", description="💰 Voir le budget actuel")
     async def budget_voir(self, interaction: discord.Interaction):
         """Affiche le budget avec graphique"""
         
+        # Le rendu peut dépasser le délai de 3 s d'une interaction : on accuse réception d'abord
+        await interaction.response.defer()
+        
         # Génération du graphique
-        graphique = self.generer_graphique()
+        try:
+            graphique = await self.generer_graphique()
+        except Exception as e:
+            # Pool cassé ou données non sérialisables : RenduGraphiques repart d'un pool neuf
+            print(f"❌ Erreur rendu du graphique du budget : {e}")
+            return await interaction.followup.send(embed=self.embed_erreur())
         
-        # Calcul des statistiques
-        total_entrees = sum(t["montant"] for t in self.budget_data["transactions"] if t["type"] == "entree")
-        total_sorties = sum(t["montant"] for t in self.budget_data["transactions"] if t["type"] == "sortie")
+        agregats = self.agregats
         
         # Création de l'embed
         embed = discord.Embed(
@@ -122,16 +234,23 @@ class Budget(commands.Cog):
             inline=False
         )
         
-        embed.add_field(name="📈 Entrées totales", value=f"{total_entrees:,.2f} €", inline=True)
-        embed.add_field(name="📉 Sorties totales", value=f"{total_sorties:,.2f} €", inline=True)
-        embed.add_field(name="🔢 Transactions", value=str(len(self.budget_data["transactions"])), inline=True)
+        embed.add_field(name="📈 Entrées totales", value=f"{agregats.entrees:,.2f} €", inline=True)
+        embed.add_field(name="📉 Sorties totales", value=f"{agregats.sorties:,.2f} €", inline=True)
+        embed.add_field(name="🔢 Transactions", value=str(agregats.nombre), inline=True)
+        
+        if agregats.nombre:
+            embed.add_field(
+                name="↕️ Solde min / max",
+                value=f"{agregats.solde_min:,.2f} € / {agregats.solde_max:,.2f} €",
+                inline=False
+            )
         
         embed.set_footer(text=f"Demandé par {interaction.user.display_name}")
         
         file = discord.File(graphique, filename="budget.png")
         embed.set_image(url="attachment://budget.png")
         
-        await interaction.response.send_message(embed=embed, file=file)
+        await interaction.followup.send(embed=embed, file=file)
 
     @app_commands.command(name="budget_ajouter", description="➕ Ajouter de l'argent au budget")
     @app_commands.describe(
@@ -192,7 +311,7 @@ class Budget(commands.Cog):
     async def budget_historique(self, interaction: discord.Interaction):
         """Affiche les 10 dernières transactions"""
         
-        if not self.budget_data["transactions"]:
+        if not self.budget_data["dernieres"]:
             await interaction.response.send_message("📭 Aucune transaction enregistrée.", ephemeral=True)
             return
         
@@ -202,8 +321,8 @@ class Budget(commands.Cog):
             timestamp=datetime.now()
         )
         
-        # Prendre les 10 dernières transactions
-        dernieres = self.budget_data["transactions"][-10:][::-1]
+        # Les 10 dernières transactions, gardées en mémoire
+        dernieres = list(self.budget_data["dernieres"])[::-1]
         
         for trans in dernieres:
             date = datetime.fromisoformat(trans["date"]).strftime("%d/%m/%Y %H:%M")
@@ -218,18 +337,137 @@ class Budget(commands.Cog):
         
         await interaction.response.send_message(embed=embed)
 
+    @app_commands.command(name="budget_rapport", description="📊 Rapport du budget par période")
+    @app_commands.describe(
+        periode="Regroupement des transactions",
+        categorie="Entrées / sorties ou dépenses par auteur",
+        periodes="Nombre de périodes affichées (les plus récentes)",
+        graphique="Joindre un graphique en barres empilées"
+    )
+    @app_commands.choices(
+        periode=[
+            app_commands.Choice(name="📅 Par semaine", value="semaine"),
+            app_commands.Choice(name="🗓️ Par mois", value="mois")
+        ],
+        categorie=[
+            app_commands.Choice(name="📈 Entrées / 📉 Sorties", value="type"),
+            app_commands.Choice(name="👤 Dépenses par auteur", value="auteur")
+        ]
+    )
+    async def budget_rapport(
+        self,
+        interaction: discord.Interaction,
+        periode: app_commands.Choice[str],
+        categorie: app_commands.Choice[str] = None,
+        periodes: app_commands.Range[int, 1, 12] = 6,
+        graphique: bool = False
+    ):
+        """Totaux par période et par catégorie"""
+        
+        await interaction.response.defer()
+        
+        categorie = categorie.value if categorie else "type"
+        try:
+            colonnes = await self.colonnes_budget()
+            if not len(colonnes):
+                await interaction.followup.send("📭 Aucune transaction enregistrée.")
+                return
+            
+            version = self.budget_data["version"]
+            rapport = await asyncio.to_thread(
+                rapport_periodes, colonnes.tableaux(), list(colonnes.noms_auteurs),
+                periode.value, categorie, periodes, MAX_AUTEURS_RAPPORT
+            )
+        except Exception as e:
+            # Journal ou archive illisible : la prochaine demande relit tout
+            print(f"❌ Erreur calcul du rapport du budget : {e}")
+            return await interaction.followup.send(
+                embed=self.embed_erreur("Le rapport n'a pas pu être calculé, réessayez dans un instant.")
+            )
+        
+        # Tableau aligné dans un bloc de code
+        noms = [nom[:9] for nom in rapport["categories"]] + ["Net"]
+        largeur = 11
+        lignes = [f"{'Période':<14}" + "".join(f"{nom:>{largeur}}" for nom in noms)]
+        for libelle, valeurs, net in zip(rapport["periodes"], rapport["valeurs"], rapport["nets"]):
+            lignes.append(
+                f"{libelle:<14}" + "".join(f"{valeur:>{largeur},.2f}" for valeur in valeurs + [net])
+            )
+        
+        embed = discord.Embed(
+            title=f"📊 Budget {periode.name.split(' ', 1)[1].lower()}",
+            description="```\n" + "\n".join(lignes) + "\n```",
+            color=discord.Color.gold(),
+            timestamp=datetime.now()
+        )
+        embed.set_footer(text=f"{len(colonnes)} transaction(s) • Demandé par {interaction.user.display_name}")
+        
+        if not graphique:
+            await interaction.followup.send(embed=embed)
+            return
+        
+        async def produire():
+            return await self.rendu.rendre(
+                rendu_barres_empilees, rapport["periodes"], rapport["categories"],
+                rapport["valeurs"], DPI_GRAPHIQUE
+            )
+        
+        cle = CacheGraphiques.empreinte("rapport_budget", version, {
+            "periode": periode.value, "categorie": categorie, "periodes": periodes, "dpi": DPI_GRAPHIQUE
+        })
+        try:
+            image = await self.cache_graphiques.obtenir(cle, produire)
+        except Exception as e:
+            print(f"❌ Erreur rendu du rapport du budget : {e}")
+            return await interaction.followup.send(embed=self.embed_erreur())
+        file = discord.File(BytesIO(image), filename="rapport.png")
+        embed.set_image(url="attachment://rapport.png")
+        
+        await interaction.followup.send(embed=embed, file=file)
+
     @app_commands.command(name="budget_reset", description="🔄 Réinitialiser le budget (ADMIN)")
     @app_commands.checks.has_permissions(administrator=True)
     async def budget_reset(self, interaction: discord.Interaction):
-        """Réinitialise complètement le budget"""
+        """Remet le budget à zéro ; la réinitialisation est inscrite au journal"""
         
-        self.budget_data = {
-            "solde": 0,
-            "transactions": []
+        reinitialisation = {
+            "date": datetime.now().isoformat(),
+            "type": REINITIALISATION,
+            "auteur": interaction.user.display_name,
+            "solde_avant": self.budget_data["solde"]
         }
-        self.save_data()
+        self.budget_data = self.etat_vide(self.budget_data["position"], self.budget_data["version"])
+        self.agregats = AgregatsBudget()
+        self.colonnes = ColonnesBudget()
+        self.journaliser(reinitialisation)
         
         await interaction.response.send_message("✅ Le budget a été réinitialisé à zéro.", ephemeral=True)
 
+    @app_commands.command(name="budget_compacter", description="🗜️ Archiver le journal jusqu'au dernier instantané (ADMIN)")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def budget_compacter(self, interaction: discord.Interaction):
+        """Déplace les lignes du journal devenues inutiles vers l'archive mensuelle"""
+        
+        position = self.budget_data["instantane"]
+        if not position:
+            await interaction.response.send_message(
+                "📭 Aucun instantané : rien à compacter.", ephemeral=True
+            )
+            return
+        
+        await interaction.response.defer(ephemeral=True)
+        
+        # Le thread d'écriture a déjà écrit l'instantané : il suffit, avec les
+        # lignes suivantes, à recharger l'état
+        deplaces = await asyncio.wrap_future(self.bot.stockage.soumettre(
+            compacter_journal, self.bot.stockage, self.db_transactions, self.archive, position
+        ))
+        print(f"🗜️ Journal du budget compacté : {deplaces} ligne(s) archivée(s)")
+        
+        await interaction.followup.send(
+            f"✅ {deplaces} ligne(s) archivée(s), jusqu'au dernier instantané (position {position}).",
+            ephemeral=True
+        )
+
 async def setup(bot):
     await bot.add_cog(Budget(bot))
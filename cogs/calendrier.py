@@ -1,29 +1,27 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
-import json
-import os
+import asyncio
 from datetime import datetime
 
 class Calendrier(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.data_file = "data/calendrier.json"
+        self.db = bot.stockage.collection("calendrier")
         self.channel_id = 1462916585793786061  # Channel du calendrier
-        self.events = self.load_data()
+        self.events = {}
+    
+    async def cog_load(self):
+        """Lecture de la base hors de la boucle d'événements"""
+        self.events = await asyncio.to_thread(self.load_data)
     
     def load_data(self):
-        """Charge les événements depuis le fichier JSON"""
-        if os.path.exists(self.data_file):
-            with open(self.data_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return {}
+        """Charge les événements depuis la base"""
+        return self.db.load()
     
-    def save_data(self):
-        """Sauvegarde les événements dans le fichier JSON"""
-        os.makedirs(os.path.dirname(self.data_file), exist_ok=True)
-        with open(self.data_file, 'w', encoding='utf-8') as f:
-            json.dump(self.events, f, indent=4, ensure_ascii=False)
+    def save_week(self, week_key):
+        """Sauvegarde uniquement la semaine modifiée"""
+        self.db.set_differe(week_key, self.events[week_key])
     
     def get_week_key(self):
         """Retourne la clé de la semaine actuelle (ex: 2024-W52)"""
@@ -150,7 +148,7 @@ class Calendrier(commands.Cog):
         
         # Ajoute l'événement
         self.events[week_key][jour.value][heure_format].append(evenement)
-        self.save_data()
+        self.save_week(week_key)
         
         # Met à jour le calendrier
         await self.update_calendar_message()
@@ -218,7 +216,7 @@ class Calendrier(commands.Cog):
         
         # Supprime l'événement (index - 1 car liste commence à 0)
         removed_event = events.pop(index - 1)
-        self.save_data()
+        self.save_week(week_key)
         
         # Met à jour le calendrier
         await self.update_calendar_message()
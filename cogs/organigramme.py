@@ -1,26 +1,27 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
+import asyncio
 import os
-import json
 
 class Organigramme(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.channel_id = int(os.getenv('CHANNEL_ORGANIGRAMME'))
-        self.data_file = "data/organigramme.json"
+        self.db = bot.stockage.collection("organigramme")
         
-        # Créer le dossier data s'il n'existe pas
-        os.makedirs("data", exist_ok=True)
-        
-        # Initialiser les données
-        self.data = self._load_data()
+        # Initialiser les données (chargées dans cog_load)
+        self.data = {}
+
+    async def cog_load(self):
+        """Lecture de la base hors de la boucle d'événements"""
+        self.data = await asyncio.to_thread(self._load_data)
 
     def _load_data(self):
-        """Charge les données depuis le JSON"""
-        if os.path.exists(self.data_file):
-            with open(self.data_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+        """Charge les données depuis la base"""
+        data = self.db.load()
+        if data:
+            return data
         else:
             # Données par défaut
             default_data = {
@@ -35,12 +36,11 @@ class Organigramme(commands.Cog):
             return default_data
 
     def _save_data(self, data=None):
-        """Sauvegarde les données dans le JSON"""
+        """Sauvegarde les postes dans la base"""
         if data is None:
             data = self.data
         
-        with open(self.data_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=4)
+        self.db.set_many(data.items())
 
     @app_commands.command(name="modifier_poste", description="Modifie un poste de l'organigramme")
     @app_commands.describe(
@@ -61,7 +61,7 @@ class Organigramme(commands.Cog):
         
         # Modifier le poste
         self.data[poste] = titulaire
-        self._save_data()
+        self.db.set_differe(poste, titulaire)
         
         # Mettre à jour le message
         await self._update_message()
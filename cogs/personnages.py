@@ -1,8 +1,7 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
-import json
-import os
+import asyncio
 from datetime import datetime
 from discord.ui import Modal, TextInput
 
@@ -60,7 +59,7 @@ class PersonnageModal(Modal, title="Fiche Personnage RP"):
         }
         
         # ✅ SAUVEGARDE IMMÉDIATE
-        self.cog.save_data()
+        self.cog.save_personnage(self.user_id)
         
         embed = discord.Embed(
             title="✅ Personnage Enregistré !",
@@ -75,27 +74,26 @@ class PersonnageModal(Modal, title="Fiche Personnage RP"):
 class Personnages(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.data_file = "data/personnages.json"
-        self.personnages = self.load_data()
+        self.db = bot.stockage.collection("personnages")
+        self.personnages = {}
+    
+    async def cog_load(self):
+        """Lecture de la base hors de la boucle d'événements"""
+        self.personnages = await asyncio.to_thread(self.load_data)
     
     def load_data(self):
-        """Charge les données depuis le fichier JSON"""
-        if os.path.exists(self.data_file):
-            try:
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"❌ Erreur chargement personnages : {e}")
-                return {}
-        return {}
+        """Charge les données depuis la base"""
+        try:
+            return self.db.load()
+        except Exception as e:
+            print(f"❌ Erreur chargement personnages : {e}")
+            return {}
     
-    def save_data(self):
-        """Sauvegarde les données dans le fichier JSON"""
-        os.makedirs("data", exist_ok=True)
+    def save_personnage(self, user_id):
+        """Sauvegarde la fiche d'un seul membre"""
         try:
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(self.personnages, f, indent=2, ensure_ascii=False)
-            print(f"💾 Personnages sauvegardés ({len(self.personnages)} fiches)")
+            self.db.set_differe(user_id, self.personnages[user_id])
+            print(f"💾 Personnage sauvegardé ({len(self.personnages)} fiches)")
         except Exception as e:
             print(f"❌ Erreur sauvegarde personnages : {e}")
     
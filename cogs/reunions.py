@@ -1,121 +1,494 @@
 import discord
 from discord import app_commands
 from discord.ext import commands, tasks
-import json
+import asyncio
 import os
+import time
 from datetime import datetime, timedelta
 
+import aiohttp
+
+from config.settings import ENVOIS_INTERVALLE_RAPPORT
+from utils.archive import ArchiveMensuelle
+from utils.envois import FileEnvois
+from utils.planificateur import Planificateur
+from utils.reunion import FREQUENCES, Reunion, RegistreReunions
+
+# Événement → décalage par rapport au début de la réunion
+ECHEANCES = (
+    ("rappel_30min", timedelta(minutes=-30)),
+    ("rappel_5min", timedelta(minutes=-5)),
+    ("rappel_debut", timedelta(0)),
+    ("purge", timedelta(hours=24)),
+)
+DECALAGES = dict(ECHEANCES)
+
+# Ordre d'envoi quand plusieurs rappels sont dus ensemble : le plus urgent d'abord
+PRIORITES = {"rappel_debut": 0, "rappel_5min": 1, "rappel_30min": 2}
+PRIORITE_EDITION = 3
+
+# Suivi des présences en vocal : de 15 minutes avant le début à 3 heures après
+AVANCE_VOCAL = timedelta(minutes=15)
+DUREE_VOCAL = timedelta(hours=3)
+
+# Taille maximale d'une série (un an de réunions quotidiennes)
+MAX_OCCURRENCES = 366
+
+# Secondes pendant lesquelles les réactions sont regroupées avant d'éditer l'annonce
+DELAI_EDITION = 3
+
+# Durée pendant laquelle on n'essaie plus d'écrire à un membre aux MP fermés
+DUREE_BLOCAGE_MP = 24 * 3600
+
+
+def erreur_transitoire(erreur):
+    """Erreurs Discord/réseau qui valent un nouvel essai (les 403/404 n'en valent pas)"""
+    if isinstance(erreur, discord.HTTPException):
+        return erreur.status == 429 or erreur.status >= 500
+    return isinstance(erreur, (asyncio.TimeoutError, aiohttp.ClientError, OSError))
+
+
+# Secondes pendant lesquelles les modifications d'une rafale de réactions sont regroupées
+DELAI_ENREGISTREMENT = 2
+
+# Annonces relues en parallèle lors de la réconciliation des réponses au démarrage
+RECONCILIATION_CONCURRENCE = 10
+
 class Reunions(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.data_file = "data/reunions.json"
-        self.reunions = self.load_data()
-        self.check_reminders.start()
+        self.db = bot.stockage.collection("reunions")
+        self.reunions = RegistreReunions()
+        self.archive = ArchiveMensuelle(
+            os.path.join(os.path.dirname(bot.stockage.chemin), "archives", "reunions"),
+            champs_index=("guild_id", "organisateur_id", "participants_invites")
+        )
+        self.planificateur = Planificateur(self.traiter_echeances)
+        self.tache_rappels = None
+        self.envois_salons = FileEnvois("Messages de réunions", travailleurs=4)
+        self.envois_mp = FileEnvois(
+            "MP de réunions", travailleurs=2,
+            tentatives=4, delai_reessai=2.0, transitoire=erreur_transitoire
+        )
+        self.mp_envoyes = {}  # id réunion → {membre: dernier état reçu en MP}
+        self.mp_bloques = {}  # membre → horodatage jusqu'auquel ses MP sont ignorés
+        self.tache_reconciliation = None
+        self.salons_suivis = {}  # salon vocal → {id réunion: réunion} des réunions en cours
+        self.presences_ouvertes = {}  # id réunion → {membre: arrivée dans le salon}
+        self.editions_prevues = {}  # id réunion → minuterie de mise à jour de l'annonce
+        self.compteurs_affiches = {}  # id réunion → (occurrence, confirmés, absents) affichés depuis le démarrage
+        self.reunions_modifiees = {}
+        self.enregistrement_prevu = None
+    
+    async def cog_load(self):
+        """Lecture de la base hors de la boucle d'événements"""
+        self.reunions = RegistreReunions(await asyncio.to_thread(self.load_data))
+        for reunion in self.reunions:
+            self.planifier_reunion(reunion)
+        self.tache_rappels = asyncio.create_task(self.lancer_rappels())
+        self.rapport_envois.start()
     
     def load_data(self):
-        """Charge les réunions depuis le fichier JSON"""
-        if os.path.exists(self.data_file):
-            with open(self.data_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return []
-    
-    def save_data(self):
-        """Sauvegarde les réunions dans le fichier JSON"""
-        os.makedirs(os.path.dirname(self.data_file), exist_ok=True)
-        with open(self.data_file, 'w', encoding='utf-8') as f:
-            json.dump(self.reunions, f, indent=4, ensure_ascii=False)
+        """Charge les réunions depuis la base (dates converties une fois pour toutes)"""
+        return [Reunion.from_dict(donnees) for donnees in self.db.values()]
+    
+    def save_reunion(self, reunion):
+        """Sauvegarde une seule réunion (une ligne de la base)"""
+        self.reunions_modifiees.pop(reunion.id, None)
+        self.db.set_differe(reunion.id, reunion.to_dict())
+    
+    def marquer_modifiee(self, reunion):
+        """
+        Note une réunion à sauvegarder : les modifications rapprochées (rafale
+        de réactions) sont écrites ensemble quelques secondes plus tard
+        """
+        self.reunions_modifiees[reunion.id] = reunion
+        if self.enregistrement_prevu is None:
+            self.enregistrement_prevu = asyncio.get_running_loop().call_later(
+                DELAI_ENREGISTREMENT, self.enregistrer_modifications
+            )
+    
+    def enregistrer_modifications(self):
+        """Écrit toutes les réunions modifiées dans un seul commit"""
+        if self.enregistrement_prevu is not None:
+            self.enregistrement_prevu.cancel()
+            self.enregistrement_prevu = None
+        if not self.reunions_modifiees:
+            return
+        with self.bot.stockage.lot():
+            for reunion in list(self.reunions_modifiees.values()):
+                self.save_reunion(reunion)
+    
+    def ajouter_reunion(self, reunion):
+        """Enregistre une nouvelle réunion en mémoire et arme ses rappels"""
+        self.reunions.ajouter(reunion)
+        self.planifier_reunion(reunion)
+    
+    def supprimer_reunion(self, reunion):
+        """Retire une réunion de la mémoire, de la base et du planificateur"""
+        self.arreter_suivi_vocal(reunion)
+        self.reunions.retirer(reunion)
+        self.reunions_modifiees.pop(reunion.id, None)
+        self.mp_envoyes.pop(reunion.id, None)
+        self.compteurs_affiches.pop(reunion.id, None)
+        minuterie = self.editions_prevues.pop(reunion.id, None)
+        if minuterie:
+            minuterie.cancel()
+        self.planificateur.annuler(reunion.id)
+        self.db.delete_differe(reunion.id)
+    
+    def planifier_reunion(self, reunion):
+        """
+        (Ré)arme les rappels encore à envoyer et la clôture de l'occurrence en
+        cours. Une série n'a jamais que les échéances de cette occurrence dans
+        le planificateur : la suivante est armée quand celle-ci est close.
+        """
+        echeances = [
+            (reunion.date + decalage, evenement)
+            for evenement, decalage in ECHEANCES
+            if evenement != "purge" and not getattr(reunion, f"{evenement}_envoye", False)
+        ]
+        if reunion.salon_vocal_id is not None and datetime.now() < reunion.date + DUREE_VOCAL:
+            echeances.append((reunion.date - AVANCE_VOCAL, "vocal_debut"))
+            echeances.append((reunion.date + DUREE_VOCAL, "vocal_fin"))
+        echeances.append((reunion.fin_occurrence(), "purge"))
+        self.planificateur.planifier(reunion.id, echeances)
+    
+    # ========================================
+    # 🎙️ PRÉSENCES EN VOCAL
+    # ========================================
+    
+    def suivre_vocal(self, reunion):
+        """Commence à suivre le salon vocal d'une réunion (membres déjà connectés compris)"""
+        self.salons_suivis.setdefault(reunion.salon_vocal_id, {})[reunion.id] = reunion
+        ouvertes = self.presences_ouvertes.setdefault(reunion.id, {})
+        maintenant = time.time()
+        salon = self.bot.get_channel(reunion.salon_vocal_id)
+        for membre in getattr(salon, "members", ()):
+            if not membre.bot:
+                ouvertes.setdefault(membre.id, maintenant)
+    
+    def arreter_suivi_vocal(self, reunion):
+        """Clôt les présences en cours et cesse de suivre le salon"""
+        suivies = self.salons_suivis.get(reunion.salon_vocal_id)
+        if suivies is not None:
+            suivies.pop(reunion.id, None)
+            if not suivies:
+                del self.salons_suivis[reunion.salon_vocal_id]
+        
+        ouvertes = self.presences_ouvertes.pop(reunion.id, None)
+        if ouvertes:
+            maintenant = time.time()
+            for membre_id, arrivee in ouvertes.items():
+                reunion.ajouter_presence(membre_id, maintenant - arrivee)
+            self.reunions_modifiees[reunion.id] = reunion
+    
+    @commands.Cog.listener()
+    async def on_voice_state_update(self, member, before, after):
+        """Ouvre/ferme l'intervalle de présence d'un membre dans un salon suivi"""
+        if member.bot or not self.salons_suivis:
+            return
+        avant = before.channel.id if before.channel else None
+        apres = after.channel.id if after.channel else None
+        if avant == apres:
+            return  # Micro coupé, caméra... : pas un déplacement
+        
+        maintenant = time.time()
+        for reunion in self.salons_suivis.get(avant, {}).values():
+            arrivee = self.presences_ouvertes[reunion.id].pop(member.id, None)
+            if arrivee is not None:
+                reunion.ajouter_presence(member.id, maintenant - arrivee)
+                self.marquer_modifiee(reunion)
+        for reunion in self.salons_suivis.get(apres, {}).values():
+            self.presences_ouvertes[reunion.id].setdefault(member.id, maintenant)
     
     def cog_unload(self):
-        """Arrête la boucle lors du déchargement du cog"""
-        self.check_reminders.cancel()
+        """Arrête le planificateur et écrit les modifications en attente"""
+        if self.tache_rappels:
+            self.tache_rappels.cancel()
+        if self.tache_reconciliation:
+            self.tache_reconciliation.cancel()
+        self.rapport_envois.cancel()
+        for minuterie in self.editions_prevues.values():
+            minuterie.cancel()
+        self.editions_prevues.clear()
+        for file_envois in (self.envois_salons, self.envois_mp):
+            file_envois.arreter()
+            if file_envois.envoyes or file_envois.echecs:
+                print(file_envois.rapport())
+        self.enregistrer_modifications()
     
-    @tasks.loop(minutes=1)
-    async def check_reminders(self):
-        """Vérifie et envoie les rappels de réunions"""
+    @tasks.loop(seconds=ENVOIS_INTERVALLE_RAPPORT)
+    async def rapport_envois(self):
+        """Débit, file d'attente et retard des envois sur la période écoulée"""
+        for file_envois in (self.envois_salons, self.envois_mp):
+            rapport = file_envois.rapport_periode()
+            if rapport:
+                print(rapport)
+    
+    @rapport_envois.before_loop
+    async def avant_rapport_envois(self):
+        await self.bot.wait_until_ready()
+        # Le premier tour de tasks.loop est immédiat : on part d'une période vide
+        for file_envois in (self.envois_salons, self.envois_mp):
+            file_envois.rapport_periode()
+    
+    async def lancer_rappels(self):
+        await self.bot.wait_until_ready()
+        # Les rappels n'attendent pas la réconciliation, qui tourne à côté
+        # (réunions les plus proches relues en premier)
+        self.lancer_reconciliation()
+        await self.planificateur.tourner()
+    
+    @commands.Cog.listener()
+    async def on_ready(self):
+        """Rattrape les réactions ✅/❌ posées pendant que le bot était hors ligne"""
+        await self.lancer_reconciliation()
+    
+    def lancer_reconciliation(self):
+        """Tâche de réconciliation en cours, ou une nouvelle (jamais deux à la fois)"""
+        if self.tache_reconciliation is None or self.tache_reconciliation.done():
+            self.tache_reconciliation = asyncio.create_task(self.reconcilier())
+        return self.tache_reconciliation
+    
+    async def reconcilier(self):
         try:
-            now = datetime.now()
-            reunions_a_supprimer = []
-            
-            for reunion in self.reunions:
-                date_reunion = datetime.fromisoformat(reunion['date'])
-                
-                rappel_30min = date_reunion - timedelta(minutes=30)
-                rappel_5min = date_reunion - timedelta(minutes=5)
-                
-                # ⏰ RAPPEL 30 MINUTES AVANT
-                if not reunion.get('rappel_30min_envoye') and now >= rappel_30min and now < date_reunion:
-                    await self.send_reminder(reunion, "30 minutes", discord.Color.blue())
-                    reunion['rappel_30min_envoye'] = True
-                    self.save_data()
-                
-                # ⏰ RAPPEL 5 MINUTES AVANT
-                if not reunion.get('rappel_5min_envoye') and now >= rappel_5min and now < date_reunion:
-                    await self.send_reminder(reunion, "5 minutes", discord.Color.orange())
-                    reunion['rappel_5min_envoye'] = True
-                    self.save_data()
-                
-                # 🚀 RAPPEL AU DÉBUT
-                if not reunion.get('rappel_debut_envoye') and now >= date_reunion and now < date_reunion + timedelta(minutes=5):
-                    await self.send_reminder(reunion, "maintenant", discord.Color.red(), debut=True)
-                    reunion['rappel_debut_envoye'] = True
-                    self.save_data()
-                
-                # 🗑️ Suppression 24h après
-                if now > date_reunion + timedelta(hours=24):
-                    reunions_a_supprimer.append(reunion)
+            await self.reconcilier_reponses()
+        except Exception as e:
+            print(f"❌ Erreur réconciliation des réponses: {e}")
+    
+    async def reconcilier_reponses(self):
+        """
+        Relit les réactions de toutes les annonces actives (RECONCILIATION_CONCURRENCE
+        à la fois, les réunions les plus proches d'abord) et corrige chaque
+        réunion dès que sa lecture revient, puis enregistre les réunions
+        corrigées en un seul commit.
+        
+        Les réactions reçues en direct pendant une lecture ont déjà été
+        traitées : seuls les membres dont la réponse n'a pas bougé depuis le
+        début de la lecture prennent l'état relu.
+        """
+        debut = time.perf_counter()
+        limite = asyncio.Semaphore(RECONCILIATION_CONCURRENCE)
+        # Les prochains rappels partent avec des réponses à jour le plus tôt possible
+        reunions = sorted(self.reunions, key=lambda r: r.date)
+        changements = 0
+        reunions_changees = []
+        
+        async def reconcilier_une(reunion):
+            nonlocal changements
+            async with limite:
+                avant = (reunion.occurrence, set(reunion.confirmes), set(reunion.absents))
+                reactions = await self.lire_reactions(reunion)
+            # Réunion supprimée, occurrence suivante ou annonce illisible pendant la lecture
+            if reactions is None or reunion not in self.reunions or reunion.occurrence != avant[0]:
+                return
+            _, confirmes_avant, absents_avant = avant
+            oui, non = reactions
+            oui &= reunion.invites
+            non &= reunion.invites
+            # Les deux réactions : on garde la réponse déjà connue, sinon présent
+            deux = oui & non
+            confirmes = (oui - non) | {u for u in deux if u not in absents_avant}
+            absents = (non - oui) | {u for u in deux if u in absents_avant}
             
-            for reunion in reunions_a_supprimer:
-                self.reunions.remove(reunion)
+            ecart = 0
+            for membre in (confirmes ^ confirmes_avant) | (absents ^ absents_avant):
+                if (membre in reunion.confirmes) != (membre in confirmes_avant) or \
+                        (membre in reunion.absents) != (membre in absents_avant):
+                    continue  # Réaction traitée en direct pendant la lecture : plus récente
+                for relus, connus in ((confirmes, reunion.confirmes), (absents, reunion.absents)):
+                    if membre in relus:
+                        connus.add(membre)
+                    else:
+                        connus.discard(membre)
+                ecart += 1
+            if ecart:
+                changements += ecart
+                reunions_changees.append(reunion)
+                self.programmer_edition(reunion)
+        
+        await asyncio.gather(*(reconcilier_une(r) for r in reunions))
+        
+        if reunions_changees:
+            with self.bot.stockage.lot():
+                for reunion in reunions_changees:
+                    if reunion in self.reunions:
+                        self.save_reunion(reunion)
+        
+        print(
+            f"🔄 Réponses aux réunions réconciliées : {len(reunions)} annonce(s) relue(s), "
+            f"{changements} changement(s) dans {len(reunions_changees)} réunion(s) "
+            f"en {time.perf_counter() - debut:.2f} s"
+        )
+    
+    async def lire_reactions(self, reunion):
+        """Membres ayant réagi ✅ et ❌ à l'annonce ; None si elle est introuvable"""
+        channel = self.bot.get_channel(reunion.channel_id)
+        if not channel:
+            return None
+        try:
+            message = await channel.fetch_message(reunion.message_id)
+            oui, non = set(), set()
+            for reaction in message.reactions:
+                emoji = str(reaction.emoji)
+                if emoji not in ("✅", "❌"):
+                    continue
+                # Seul le bot a réagi : pas besoin de lister les membres
+                if reaction.count <= (1 if reaction.me else 0):
+                    continue
+                membres = {user.id async for user in reaction.users() if not user.bot}
+                (oui if emoji == "✅" else non).update(membres)
+            return oui, non
+        except (discord.NotFound, discord.Forbidden):
+            return None
+        except discord.HTTPException as e:
+            print(f"⚠️ Annonce de {reunion.titre} illisible : {e}")
+            return None
+    
+    async def check_reminders(self):
+        """Envoie les rappels dont l'échéance est passée (un passage du planificateur)"""
+        return await self.planificateur.passage()
+    
+    async def traiter_echeances(self, echeances):
+        """
+        Rappels et purges échus lors d'un même réveil du planificateur.
+        Les drapeaux « rappel envoyé » de tout le passage sont validés en un
+        seul commit AVANT les envois : après un crash, un rappel peut manquer
+        mais n'est jamais envoyé deux fois.
+        """
+        now = datetime.now()
+        rappels = []
+        reunions_a_supprimer = []
+        
+        for reunion_id, evenement in echeances:
+            reunion = self.reunions.get(reunion_id)
+            if not reunion:
+                continue
+            
+            # 📦 Archivage 24h après (ou occurrence suivante d'une série)
+            if evenement == "purge":
+                self.arreter_suivi_vocal(reunion)
+                reunions_a_supprimer.append(reunion)
+                continue
+            
+            # 🎙️ Fenêtre de suivi du salon vocal
+            if evenement == "vocal_debut":
+                self.suivre_vocal(reunion)
+                continue
+            if evenement == "vocal_fin":
+                self.arreter_suivi_vocal(reunion)
+                continue
             
-            if reunions_a_supprimer:
-                self.save_data()
+            setattr(reunion, f"{evenement}_envoye", True)
+            self.reunions_modifiees[reunion.id] = reunion
+            
+            # ⏰ RAPPELS 30 ET 5 MINUTES AVANT (ignorés si la réunion a commencé)
+            if evenement == "rappel_30min" and now < reunion.date:
+                rappels.append((evenement, reunion, "30 minutes", discord.Color.blue(), False))
+            elif evenement == "rappel_5min" and now < reunion.date:
+                rappels.append((evenement, reunion, "5 minutes", discord.Color.orange(), False))
+            
+            # 🚀 RAPPEL AU DÉBUT (jusqu'à 5 minutes de retard)
+            elif evenement == "rappel_debut" and now < reunion.date + timedelta(minutes=5):
+                rappels.append((evenement, reunion, "maintenant", discord.Color.red(), True))
         
-        except Exception as e:
-            print(f"❌ Erreur vérification rappels: {e}")
+        # 📦 Les réunions terminées partent dans l'archive (avant leur suppression :
+        # le thread d'écriture exécute les deux dans l'ordre)
+        if reunions_a_supprimer:
+            archivees = [dict(r.to_dict(), archivee_le=now.isoformat()) for r in reunions_a_supprimer]
+            self.bot.stockage.soumettre(self.archive.ajouter, archivees)
+        
+        # 💾 Un seul commit pour le passage (et les réactions en attente)
+        with self.bot.stockage.lot():
+            for reunion in reunions_a_supprimer:
+                if reunion.avancer():
+                    self.nouvelle_occurrence(reunion)
+                else:
+                    self.supprimer_reunion(reunion)
+            self.enregistrer_modifications()
+        
+        if not rappels:
+            return
+        await self.bot.stockage.synchroniser()
+        
+        # 📣 Envois en parallèle, un à la fois par salon (même seau de limite Discord)
+        for evenement, reunion, temps, couleur, debut in rappels:
+            self.envois_salons.ajouter(
+                lambda r=reunion, t=temps, c=couleur, d=debut: self.send_reminder(r, t, c, debut=d),
+                priorite=PRIORITES[evenement],
+                seau=reunion.channel_id,
+                prevu=(reunion.date + DECALAGES[evenement]).timestamp()
+            )
     
-    @check_reminders.before_loop
-    async def before_check_reminders(self):
-        await self.bot.wait_until_ready()
+    def nouvelle_occurrence(self, reunion):
+        """Une série passe à l'occurrence suivante : rappels, annonce et réactions repartent de zéro"""
+        self.reunions_modifiees[reunion.id] = reunion
+        self.mp_envoyes.pop(reunion.id, None)
+        self.planifier_reunion(reunion)
+        self.lancer_edition(reunion.id)
+        self.envois_salons.ajouter(
+            lambda: self.reinitialiser_reactions(reunion.id),
+            priorite=PRIORITE_EDITION,
+            seau=reunion.channel_id,
+            cle=("reactions", reunion.id)
+        )
+    
+    async def reinitialiser_reactions(self, reunion_id):
+        """Retire les ✅/❌ de l'occurrence précédente sur l'annonce d'une série"""
+        reunion = self.reunions.get(reunion_id)
+        channel = reunion and self.bot.get_channel(reunion.channel_id)
+        if not channel:
+            return
+        message = channel.get_partial_message(reunion.message_id)
+        try:
+            await message.clear_reactions()
+            await message.add_reaction("✅")
+            await message.add_reaction("❌")
+        except discord.Forbidden:
+            print(f"⚠️ Permission « Gérer les messages » requise pour réinitialiser les réactions de {reunion.titre}")
+        except discord.NotFound:
+            pass
     
     async def send_reminder(self, reunion, temps, couleur, debut=False):
         """Envoie un rappel dans le channel"""
         try:
-            guild = self.bot.get_guild(reunion['guild_id'])
+            guild = self.bot.get_guild(reunion.guild_id)
             if not guild:
                 return
             
-            channel = guild.get_channel(reunion['channel_id'])
+            channel = guild.get_channel(reunion.channel_id)
             if not channel:
                 return
             
             # 🎯 PING UNIQUEMENT LES PARTICIPANTS CONFIRMÉS (✅)
-            mentions = " ".join([f"<@{user_id}>" for user_id in reunion.get('participants_confirmes', [])])
+            mentions = " ".join([f"<@{user_id}>" for user_id in reunion.confirmes])
             
             if not mentions:
                 mentions = "⚠️ Aucun participant confirmé"
             
             if debut:
                 titre = "🔴 LA RÉUNION COMMENCE MAINTENANT !"
-                description = f"**{reunion['titre']}** démarre **tout de suite** !"
+                description = f"**{reunion.titre}** démarre **tout de suite** !"
             else:
                 titre = f"⏰ Rappel de Réunion - Dans {temps}"
-                description = f"**{reunion['titre']}** commence dans **{temps}** !"
+                description = f"**{reunion.titre}** commence dans **{temps}** !"
             
             embed = discord.Embed(
                 title=titre,
                 description=description,
                 color=couleur,
-                timestamp=datetime.fromisoformat(reunion['date'])
+                timestamp=reunion.date
             )
             
             embed.add_field(
                 name="📋 Sujet",
-                value=reunion['sujet'],
+                value=reunion.sujet,
                 inline=False
             )
             
-            nb_confirmes = len(reunion.get('participants_confirmes', []))
-            nb_absents = len(reunion.get('participants_absents', []))
+            nb_confirmes = len(reunion.confirmes)
+            nb_absents = len(reunion.absents)
             
             embed.add_field(
                 name="👥 Participants",
@@ -126,17 +499,119 @@ class Reunions(commands.Cog):
             if debut:
                 embed.add_field(
                     name="🎯 Action Requise",
-                    value="**Rejoignez le salon vocal maintenant !**",
+                    value=(
+                        f"**Rejoignez <#{reunion.salon_vocal_id}> maintenant !**"
+                        if reunion.salon_vocal_id else "**Rejoignez le salon vocal maintenant !**"
+                    ),
                     inline=False
                 )
             
-            embed.set_footer(text=f"Organisé par {reunion['organisateur_name']}")
+            embed.set_footer(text=f"Organisé par {reunion.organisateur_name}")
             
             await channel.send(content=mentions, embed=embed)
             
         except Exception as e:
             print(f"❌ Erreur envoi rappel: {e}")
     
+    def embed_annonce(self, reunion):
+        """Embed du message d'annonce, avec les compteurs ✅/❌ à jour"""
+        embed = discord.Embed(
+            title="📅 Nouvelle Réunion Planifiée",
+            description=f"**{reunion.titre}**",
+            color=discord.Color.blue(),
+            timestamp=reunion.date
+        )
+        
+        embed.add_field(
+            name="📋 Sujet",
+            value=reunion.sujet,
+            inline=False
+        )
+        
+        embed.add_field(
+            name="🕐 Date & Heure",
+            value=f"📅 {reunion.date.strftime('%d/%m/%Y')}\n🕐 {reunion.date.strftime('%H:%M')}",
+            inline=True
+        )
+        
+        embed.add_field(
+            name="👥 Participants Invités",
+            value=(
+                f"{len(reunion.invites)} personne(s)\n"
+                f"✅ {len(reunion.confirmes)} confirmé(s) • ❌ {len(reunion.absents)} absent(s)"
+            ),
+            inline=True
+        )
+        
+        if reunion.recurrence:
+            recurrence = reunion.recurrence
+            valeur = FREQUENCES[recurrence['frequence']]
+            if recurrence['nombre'] is not None:
+                valeur += f" • occurrence {reunion.occurrence + 1}/{recurrence['nombre']}"
+            else:
+                valeur += f" • occurrence {reunion.occurrence + 1}"
+            if recurrence['fin'] is not None:
+                valeur += f"\nJusqu'au {recurrence['fin'].strftime('%d/%m/%Y')}"
+            embed.add_field(name="🔁 Récurrence", value=valeur, inline=False)
+        
+        embed.add_field(
+            name="⏰ Rappels Automatiques",
+            value="📣 30 minutes avant\n📣 5 minutes avant\n🔴 Au début",
+            inline=False
+        )
+        
+        embed.add_field(
+            name="📌 Confirmer sa Présence",
+            value="✅ Je serai présent\n❌ Je serai absent",
+            inline=False
+        )
+        
+        embed.set_footer(text=f"Organisé par {reunion.organisateur_name}")
+        return embed
+    
+    def programmer_edition(self, reunion):
+        """
+        Demande la mise à jour des compteurs de l'annonce. Les réactions
+        reçues pendant DELAI_EDITION secondes donnent une seule édition
+        """
+        if reunion.id in self.editions_prevues:
+            return
+        self.editions_prevues[reunion.id] = asyncio.get_running_loop().call_later(
+            DELAI_EDITION, self.lancer_edition, reunion.id
+        )
+    
+    def lancer_edition(self, reunion_id):
+        self.editions_prevues.pop(reunion_id, None)
+        reunion = self.reunions.get(reunion_id)
+        if not reunion:
+            return
+        # Même file et même seau que les rappels du salon, mais moins prioritaire
+        self.envois_salons.ajouter(
+            lambda: self.editer_annonce(reunion_id),
+            priorite=PRIORITE_EDITION,
+            seau=reunion.channel_id,
+            cle=("annonce", reunion_id)
+        )
+    
+    async def editer_annonce(self, reunion_id):
+        """Réécrit l'embed d'annonce si les compteurs affichés ont changé"""
+        reunion = self.reunions.get(reunion_id)
+        if not reunion:
+            return
+        compteurs = (reunion.occurrence, len(reunion.confirmes), len(reunion.absents))
+        # Inconnu après un redémarrage (None) : l'annonce est toujours réécrite une fois
+        if self.compteurs_affiches.get(reunion_id) == compteurs:
+            return
+        
+        channel = self.bot.get_channel(reunion.channel_id)
+        if not channel:
+            return
+        try:
+            await channel.get_partial_message(reunion.message_id).edit(embed=self.embed_annonce(reunion))
+            self.compteurs_affiches[reunion_id] = compteurs
+        except discord.NotFound:
+            pass  # Annonce supprimée : rien à mettre à jour
+    
     @app_commands.command(
         name="reunion",
         description="📅 Planifier une réunion avec système de confirmation"
@@ -146,8 +621,17 @@ class Reunions(commands.Cog):
         heure="Heure (format: HH:MM)",
         titre="Titre de la réunion",
         sujet="Sujet/ordre du jour",
-        participants="Mentionnez les participants (@membre1 @membre2...)"
+        participants="Mentionnez les participants (@membre1 @membre2...)",
+        recurrence="Répéter la réunion (avec une date de fin ou un nombre d'occurrences)",
+        jusqu_au="Dernière date possible d'une réunion récurrente (format: JJ/MM/AAAA)",
+        occurrences="Nombre d'occurrences d'une réunion récurrente",
+        salon_vocal="Salon vocal de la réunion (présences mesurées automatiquement)"
     )
+    @app_commands.choices(recurrence=[
+        app_commands.Choice(name="🔁 Chaque jour", value="quotidienne"),
+        app_commands.Choice(name="🔁 Chaque semaine", value="hebdomadaire"),
+        app_commands.Choice(name="🔁 Chaque mois", value="mensuelle")
+    ])
     async def reunion(
         self,
         interaction: discord.Interaction,
@@ -155,11 +639,18 @@ class Reunions(commands.Cog):
         heure: str,
         titre: str,
         sujet: str,
-        participants: str
+        participants: str,
+        recurrence: app_commands.Choice[str] = None,
+        jusqu_au: str = None,
+        occurrences: app_commands.Range[int, 2, MAX_OCCURRENCES] = None,
+        salon_vocal: discord.VoiceChannel = None
     ):
         try:
             date_str = f"{date} {heure}"
             date_reunion = datetime.strptime(date_str, "%d/%m/%Y %H:%M")
+            fin_serie = None
+            if jusqu_au:
+                fin_serie = datetime.strptime(jusqu_au, "%d/%m/%Y").replace(hour=23, minute=59)
             
             if date_reunion <= datetime.now():
                 embed = discord.Embed(
@@ -187,49 +678,35 @@ class Reunions(commands.Cog):
                 )
                 return await interaction.response.send_message(embed=embed, ephemeral=True)
             
-            # Création embed principal
-            embed = discord.Embed(
-                title="📅 Nouvelle Réunion Planifiée",
-                description=f"**{titre}**",
-                color=discord.Color.blue(),
-                timestamp=date_reunion
-            )
-            
-            embed.add_field(
-                name="📋 Sujet",
-                value=sujet,
-                inline=False
-            )
-            
-            embed.add_field(
-                name="🕐 Date & Heure",
-                value=f"📅 {date_reunion.strftime('%d/%m/%Y')}\n🕐 {date_reunion.strftime('%H:%M')}",
-                inline=True
-            )
-            
-            embed.add_field(
-                name="👥 Participants Invités",
-                value=f"{len(participant_ids)} personne(s)",
-                inline=True
-            )
-            
-            embed.add_field(
-                name="⏰ Rappels Automatiques",
-                value="📣 30 minutes avant\n📣 5 minutes avant\n🔴 Au début",
-                inline=False
-            )
+            regle = None
+            if recurrence:
+                if not fin_serie and not occurrences:
+                    embed = discord.Embed(
+                        title="❌ Erreur",
+                        description="Une réunion récurrente a besoin d'une date de fin ou d'un nombre d'occurrences !",
+                        color=discord.Color.red()
+                    )
+                    return await interaction.response.send_message(embed=embed, ephemeral=True)
+                regle = {'frequence': recurrence.value, 'debut': date_reunion, 'fin': fin_serie, 'nombre': occurrences}
             
-            embed.add_field(
-                name="📌 Confirmer sa Présence",
-                value="✅ Je serai présent\n❌ Je serai absent",
-                inline=False
+            nouvelle_reunion = Reunion(
+                id=None,
+                message_id=None,
+                guild_id=interaction.guild_id,
+                channel_id=interaction.channel_id,
+                organisateur_id=interaction.user.id,
+                organisateur_name=interaction.user.display_name,
+                date=date_reunion,
+                titre=titre,
+                sujet=sujet,
+                invites=participant_ids,
+                recurrence=regle,
+                salon_vocal_id=salon_vocal.id if salon_vocal else None
             )
             
-            embed.set_footer(text=f"Organisé par {interaction.user.display_name}")
-            
             # Envoi du message
             mentions = " ".join([f"<@{uid}>" for uid in participant_ids])
-            await interaction.response.send_message(content=mentions, embed=embed)
+            await interaction.response.send_message(content=mentions, embed=self.embed_annonce(nouvelle_reunion))
             message = await interaction.original_response()
             
             # Ajout des réactions
@@ -237,27 +714,11 @@ class Reunions(commands.Cog):
             await message.add_reaction("❌")
             
             # Sauvegarde
-            reunion_data = {
-                'id': len(self.reunions) + 1,
-                'message_id': message.id,
-                'guild_id': interaction.guild_id,
-                'channel_id': interaction.channel_id,
-                'organisateur_id': interaction.user.id,
-                'organisateur_name': interaction.user.display_name,
-                'date': date_reunion.isoformat(),
-                'titre': titre,
-                'sujet': sujet,
-                'participants_invites': participant_ids,
-                'participants_confirmes': [],
-                'participants_absents': [],
-                'rappel_30min_envoye': False,
-                'rappel_5min_envoye': False,
-                'rappel_debut_envoye': False,
-                'created_at': datetime.now().isoformat()
-            }
-            
-            self.reunions.append(reunion_data)
-            self.save_data()
+            nouvelle_reunion.id = self.reunions.prochain_id()
+            nouvelle_reunion.message_id = message.id
+            
+            self.ajouter_reunion(nouvelle_reunion)
+            self.save_reunion(nouvelle_reunion)
             
         except ValueError:
             embed = discord.Embed(
@@ -283,122 +744,145 @@ class Reunions(commands.Cog):
             return
         
         # Trouve la réunion
-        reunion = next((r for r in self.reunions if r.get('message_id') == payload.message_id), None)
+        reunion = self.reunions.par_message_id(payload.message_id)
         if not reunion:
             return
         
         # Vérifie que c'est un participant invité
-        if payload.user_id not in reunion['participants_invites']:
+        if payload.user_id not in reunion.invites:
             return
         
-        guild = self.bot.get_guild(payload.guild_id)
-        user = guild.get_member(payload.user_id)
-        
-        # ✅ CONFIRMATION DE PRÉSENCE
-        if str(payload.emoji) == "✅":
-            # Retire des absents si présent
-            if payload.user_id in reunion['participants_absents']:
-                reunion['participants_absents'].remove(payload.user_id)
-            
-            # Ajoute aux confirmés
-            if payload.user_id not in reunion['participants_confirmes']:
-                reunion['participants_confirmes'].append(payload.user_id)
-                self.save_data()
-                
-                # 📩 ENVOI DU MP
-                try:
-                    date_reunion = datetime.fromisoformat(reunion['date'])
-                    embed = discord.Embed(
-                        title="✅ Confirmation de Présence",
-                        description=f"Vous êtes bien inscrit à la réunion **{reunion['titre']}**",
-                        color=discord.Color.green(),
-                        timestamp=date_reunion
-                    )
-                    
-                    embed.add_field(
-                        name="📅 Date",
-                        value=date_reunion.strftime('%d/%m/%Y à %H:%M'),
-                        inline=True
-                    )
-                    
-                    embed.add_field(
-                        name="📋 Sujet",
-                        value=reunion['sujet'],
-                        inline=False
-                    )
-                    
-                    embed.add_field(
-                        name="⏰ Rappels",
-                        value="Vous recevrez des pings :\n📣 30 min avant\n📣 5 min avant\n🔴 Au début",
-                        inline=False
-                    )
-                    
-                    embed.set_footer(text=f"Organisé par {reunion['organisateur_name']}")
-                    
-                    await user.send(embed=embed)
-                except discord.Forbidden:
-                    print(f"⚠️ Impossible d'envoyer un MP à {user.name}")
-        
-        # ❌ DÉCLARATION D'ABSENCE
-        elif str(payload.emoji) == "❌":
-            # Retire des confirmés
-            if payload.user_id in reunion['participants_confirmes']:
-                reunion['participants_confirmes'].remove(payload.user_id)
-            
-            # Ajoute aux absents
-            if payload.user_id not in reunion['participants_absents']:
-                reunion['participants_absents'].append(payload.user_id)
-                self.save_data()
-                
-                # 📩 MP D'ABSENCE
-                try:
-                    date_reunion = datetime.fromisoformat(reunion['date'])
-                    embed = discord.Embed(
-                        title="❌ Absence Enregistrée",
-                        description=f"Votre absence à la réunion **{reunion['titre']}** a été enregistrée.",
-                        color=discord.Color.red(),
-                        timestamp=date_reunion
-                    )
-                    
-                    embed.add_field(
-                        name="📅 Date",
-                        value=date_reunion.strftime('%d/%m/%Y à %H:%M'),
-                        inline=True
-                    )
-                    
-                    embed.add_field(
-                        name="ℹ️ Information",
-                        value="Vous ne recevrez pas de rappels pour cette réunion.",
-                        inline=False
-                    )
-                    
-                    await user.send(embed=embed)
-                except discord.Forbidden:
-                    print(f"⚠️ Impossible d'envoyer un MP à {user.name}")
+        # ✅ CONFIRMATION DE PRÉSENCE / ❌ DÉCLARATION D'ABSENCE
+        emoji = str(payload.emoji)
+        if emoji == "✅":
+            change = reunion.confirmer(payload.user_id)
+        elif emoji == "❌":
+            change = reunion.declarer_absent(payload.user_id)
+        else:
+            return
+        
+        if change:
+            self.marquer_modifiee(reunion)
+            self.programmer_edition(reunion)
+            self.programmer_mp(reunion, payload.user_id)
+    
+    def programmer_mp(self, reunion, user_id):
+        """
+        Met en file le MP de confirmation. Tant qu'il n'est pas parti, un
+        nouveau changement du même membre le remplace : seul l'état final
+        est envoyé
+        """
+        bloque_jusqua = self.mp_bloques.get(user_id)
+        if bloque_jusqua is not None:
+            if time.time() < bloque_jusqua:
+                return
+            del self.mp_bloques[user_id]
+        self.envois_mp.ajouter(
+            lambda: self.envoyer_mp(reunion.id, user_id),
+            seau=user_id,
+            cle=(reunion.id, user_id)
+        )
+    
+    async def envoyer_mp(self, reunion_id, user_id):
+        """📩 Envoie au membre l'état actuel de sa réponse (exécuté par la file de MP)"""
+        reunion = self.reunions.get(reunion_id)
+        if not reunion:
+            return
+        
+        if user_id in reunion.confirmes:
+            etat = "present"
+        elif user_id in reunion.absents:
+            etat = "absent"
+        else:
+            return
+        
+        deja_envoyes = self.mp_envoyes.setdefault(reunion_id, {})
+        if deja_envoyes.get(user_id) == etat:
+            return  # Aller-retour ✅/❌ : le membre a déjà reçu cet état
+        
+        date_reunion = reunion.date
+        if etat == "present":
+            embed = discord.Embed(
+                title="✅ Confirmation de Présence",
+                description=f"Vous êtes bien inscrit à la réunion **{reunion.titre}**",
+                color=discord.Color.green(),
+                timestamp=date_reunion
+            )
+            
+            embed.add_field(
+                name="📅 Date",
+                value=date_reunion.strftime('%d/%m/%Y à %H:%M'),
+                inline=True
+            )
+            
+            embed.add_field(
+                name="📋 Sujet",
+                value=reunion.sujet,
+                inline=False
+            )
+            
+            embed.add_field(
+                name="⏰ Rappels",
+                value="Vous recevrez des pings :\n📣 30 min avant\n📣 5 min avant\n🔴 Au début",
+                inline=False
+            )
+            
+            embed.set_footer(text=f"Organisé par {reunion.organisateur_name}")
+        else:
+            embed = discord.Embed(
+                title="❌ Absence Enregistrée",
+                description=f"Votre absence à la réunion **{reunion.titre}** a été enregistrée.",
+                color=discord.Color.red(),
+                timestamp=date_reunion
+            )
+            
+            embed.add_field(
+                name="📅 Date",
+                value=date_reunion.strftime('%d/%m/%Y à %H:%M'),
+                inline=True
+            )
+            
+            embed.add_field(
+                name="ℹ️ Information",
+                value="Vous ne recevrez pas de rappels pour cette réunion.",
+                inline=False
+            )
+        
+        user = self.bot.get_user(user_id) or await self.bot.fetch_user(user_id)
+        try:
+            await user.send(embed=embed)
+            deja_envoyes[user_id] = etat
+        except discord.Forbidden:
+            # MP fermés : inutile de réessayer avant un moment
+            self.mp_bloques[user_id] = time.time() + DUREE_BLOCAGE_MP
+            print(f"⚠️ Impossible d'envoyer un MP à {user.name}")
     
     @commands.Cog.listener()
     async def on_raw_reaction_remove(self, payload):
         """Gère le retrait des réactions"""
-        reunion = next((r for r in self.reunions if r.get('message_id') == payload.message_id), None)
+        reunion = self.reunions.par_message_id(payload.message_id)
         if not reunion:
             return
         
-        if str(payload.emoji) == "✅" and payload.user_id in reunion['participants_confirmes']:
-            reunion['participants_confirmes'].remove(payload.user_id)
-            self.save_data()
+        if str(payload.emoji) == "✅" and payload.user_id in reunion.confirmes:
+            reunion.confirmes.discard(payload.user_id)
+            self.marquer_modifiee(reunion)
+            self.programmer_edition(reunion)
         
-        elif str(payload.emoji) == "❌" and payload.user_id in reunion['participants_absents']:
-            reunion['participants_absents'].remove(payload.user_id)
-            self.save_data()
+        elif str(payload.emoji) == "❌" and payload.user_id in reunion.absents:
+            reunion.absents.discard(payload.user_id)
+            self.marquer_modifiee(reunion)
+            self.programmer_edition(reunion)
     
     @app_commands.command(
         name="voir_reunions",
         description="📋 Voir toutes les réunions planifiées"
     )
     async def voir_reunions(self, interaction: discord.Interaction):
+        maintenant = datetime.now()
         reunions_futures = [
-            r for r in self.reunions 
-            if datetime.fromisoformat(r['date']) > datetime.now()
+            r for r in self.reunions.du_serveur(interaction.guild_id)
+            if r.date > maintenant
         ]
         
         if not reunions_futures:
@@ -409,7 +893,7 @@ class Reunions(commands.Cog):
             )
             return await interaction.response.send_message(embed=embed)
         
-        reunions_triees = sorted(reunions_futures, key=lambda x: x['date'])
+        reunions_triees = sorted(reunions_futures, key=lambda x: x.date)
         
         embed = discord.Embed(
             title="📅 Réunions à Venir",
@@ -418,19 +902,19 @@ class Reunions(commands.Cog):
         )
         
         for reunion in reunions_triees[:10]:
-            date_reunion = datetime.fromisoformat(reunion['date'])
-            delta = date_reunion - datetime.now()
+            date_reunion = reunion.date
+            delta = date_reunion - maintenant
             
             if delta.days > 0:
                 temps = f"Dans {delta.days}j {delta.seconds//3600}h"
             else:
                 temps = f"Dans {delta.seconds//3600}h {(delta.seconds%3600)//60}min"
             
-            nb_confirmes = len(reunion.get('participants_confirmes', []))
-            nb_absents = len(reunion.get('participants_absents', []))
+            nb_confirmes = len(reunion.confirmes)
+            nb_absents = len(reunion.absents)
             
             embed.add_field(
-                name=f"🗓️ {reunion['titre']}",
+                name=f"🗓️ {reunion.titre}",
                 value=f"📅 {date_reunion.strftime('%d/%m/%Y à %H:%M')}\n⏰ {temps}\n✅ {nb_confirmes} confirmés • ❌ {nb_absents} absents",
                 inline=False
             )
@@ -443,7 +927,7 @@ class Reunions(commands.Cog):
     )
     @app_commands.describe(reunion_id="ID de la réunion")
     async def annuler_reunion(self, interaction: discord.Interaction, reunion_id: int):
-        reunion = next((r for r in self.reunions if r['id'] == reunion_id), None)
+        reunion = self.reunions.get(reunion_id)
         
         if not reunion:
             embed = discord.Embed(
@@ -453,7 +937,7 @@ class Reunions(commands.Cog):
             )
             return await interaction.response.send_message(embed=embed, ephemeral=True)
         
-        if reunion['organisateur_id'] != interaction.user.id and not interaction.user.guild_permissions.administrator:
+        if reunion.organisateur_id != interaction.user.id and not interaction.user.guild_permissions.administrator:
             embed = discord.Embed(
                 title="❌ Permission Refusée",
                 description="Seul l'organisateur ou un admin peut annuler.",
@@ -461,16 +945,112 @@ class Reunions(commands.Cog):
             )
             return await interaction.response.send_message(embed=embed, ephemeral=True)
         
-        self.reunions.remove(reunion)
-        self.save_data()
+        self.supprimer_reunion(reunion)
         
         embed = discord.Embed(
             title="✅ Réunion Annulée",
-            description=f"**{reunion['titre']}** a été annulée.",
+            description=f"**{reunion.titre}** a été annulée.",
             color=discord.Color.green()
         )
         
         await interaction.response.send_message(embed=embed)
+    
+    @app_commands.command(
+        name="historique_reunions",
+        description="🗄️ Rechercher dans l'historique des réunions passées"
+    )
+    @app_commands.describe(
+        organisateur="Réunions organisées par ce membre",
+        participant="Réunions où ce membre était invité",
+        du="Depuis le (format: JJ/MM/AAAA)",
+        au="Jusqu'au (format: JJ/MM/AAAA)"
+    )
+    async def historique_reunions(
+        self,
+        interaction: discord.Interaction,
+        organisateur: discord.Member = None,
+        participant: discord.Member = None,
+        du: str = None,
+        au: str = None
+    ):
+        try:
+            debut = datetime.strptime(du, "%d/%m/%Y") if du else None
+            fin = datetime.strptime(au, "%d/%m/%Y") + timedelta(days=1) - timedelta(microseconds=1) if au else None
+        except ValueError:
+            embed = discord.Embed(
+                title="❌ Format Invalide",
+                description="**Format attendu :** `JJ/MM/AAAA`",
+                color=discord.Color.red()
+            )
+            return await interaction.response.send_message(embed=embed, ephemeral=True)
+        
+        index = {"guild_id": interaction.guild_id}
+        if organisateur:
+            index["organisateur_id"] = organisateur.id
+        if participant:
+            index["participants_invites"] = participant.id
+        
+        def correspond(reunion):
+            return (
+                reunion['guild_id'] == interaction.guild_id
+                and (not organisateur or reunion['organisateur_id'] == organisateur.id)
+                and (not participant or participant.id in reunion['participants_invites'])
+            )
+        
+        await interaction.response.defer()
+        try:
+            # Lecture des segments compressés hors de la boucle
+            reunions = await asyncio.to_thread(
+                self.archive.rechercher, correspond, debut, fin, index, 10
+            )
+        except Exception as e:
+            print(f"❌ Erreur lecture de l'historique des réunions : {e}")
+            embed = discord.Embed(
+                title="❌ Erreur",
+                description="Impossible de lire l'historique pour le moment, réessayez plus tard.",
+                color=discord.Color.red()
+            )
+            return await interaction.followup.send(embed=embed, ephemeral=True)
+        
+        if not reunions:
+            embed = discord.Embed(
+                title="🗄️ Historique Vide",
+                description="Aucune réunion archivée ne correspond à ces critères.",
+                color=discord.Color.blue()
+            )
+            return await interaction.followup.send(embed=embed)
+        
+        embed = discord.Embed(
+            title="🗄️ Historique des Réunions",
+            description=f"**{len(reunions)}** réunion(s) la/les plus récente(s)",
+            color=discord.Color.blue()
+        )
+        
+        for reunion in reunions:
+            date_reunion = datetime.fromisoformat(reunion['date'])
+            valeur = (
+                f"📅 {date_reunion.strftime('%d/%m/%Y à %H:%M')} • par {reunion['organisateur_name']}\n"
+                f"✅ {len(reunion['participants_confirmes'])} confirmés • "
+                f"❌ {len(reunion['participants_absents'])} absents • "
+                f"👥 {len(reunion['participants_invites'])} invités"
+            )
+            presences = reunion.get('presences_minutes')
+            if presences is not None:
+                valeur += f" • 🎙️ {len(presences)} en vocal"
+            if participant:
+                if participant.id in reunion['participants_confirmes']:
+                    valeur += f"\n{participant.display_name} : ✅ présent"
+                elif participant.id in reunion['participants_absents']:
+                    valeur += f"\n{participant.display_name} : ❌ absent"
+                else:
+                    valeur += f"\n{participant.display_name} : ❔ sans réponse"
+                if presences is not None:
+                    minutes = presences.get(str(participant.id), 0)
+                    valeur += f" • 🎙️ {minutes:.0f} min en vocal"
+            
+            embed.add_field(name=f"🗓️ {reunion['titre']}", value=valeur, inline=False)
+        
+        await interaction.followup.send(embed=embed)
 
 async def setup(bot):
     await bot.add_cog(Reunions(bot))
@@ -1,34 +1,181 @@
 import discord
 from discord import app_commands
-from discord.ext import commands
-import json
+from discord.ext import commands, tasks
+import asyncio
 import os
+import time
+from collections import defaultdict
+from datetime import datetime
+from config.settings import STATS_INTERVALLE_SAUVEGARDE, STATS_SEUIL_CHANGEMENTS
+from utils.activite import Activite, SuiviActifs, HEURES_SERVEUR, JOURS, tranches
+from utils.classement import Classement
+from utils.compteurs import CompteursMembres
+
+CRITERES = ("messages", "commandes", "reactions")
 
 class Statistiques(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.data_file = "data/statistiques.json"
-        self.stats = self.load_data()
+        self.db_serveur = bot.stockage.collection("statistiques")
+        self.db_membres = bot.stockage.collection("statistiques_membres")
+        self.db_activite = bot.stockage.collection("statistiques_activite")
+        self.stats = {"serveur": {"messages": 0, "commandes": 0}}
+        
+        # Compteurs par membre : index id → case + colonnes d'entiers (fichier binaire)
+        self.membres = CompteursMembres(
+            os.path.join(os.path.dirname(bot.stockage.chemin), "statistiques_membres.bin"), CRITERES
+        )
+        
+        # Activité par tranches horaires → jours → semaines (agrégats précalculés)
+        self.activite_serveur = self.nouvelle_activite_serveur()
+        self.activite = {}
+        self.actifs = SuiviActifs()
+        
+        # Classements tenus à jour à chaque événement (pas de tri à la demande)
+        self.classements = self.construire_classements()
+        
+        # Réactions : simple delta par membre, fusionné dans les stats par lot
+        # (une rafale sur un message populaire ne coûte qu'une addition par événement)
+        self.reactions_en_attente = defaultdict(int)
+        
+        # Écriture différée : les compteurs vivent en mémoire et sont
+        # sauvegardés par lot (intervalle ou seuil de changements)
+        self.modifie = False
+        self.membres_modifies = set()
+        self.changements = 0
+        self.sauvegarde_auto.start()
+    
+    async def cog_load(self):
+        """Lecture de la base hors de la boucle d'événements"""
+        self.stats = await asyncio.to_thread(self.load_data)
+        await asyncio.to_thread(self.load_membres)
+        await asyncio.to_thread(self.load_activite)
+        self.classements = await asyncio.to_thread(self.construire_classements)
+    
+    def construire_classements(self):
+        """Un classement par critère, en une lecture des colonnes compactes"""
+        return {critere: Classement(self.membres, critere) for critere in CRITERES}
+    
+    @staticmethod
+    def nouvelle_activite_serveur():
+        return {
+            "messages": Activite(HEURES_SERVEUR),
+            "commandes": Activite(HEURES_SERVEUR)
+        }
     
     def load_data(self):
-        """Charge les stats depuis le JSON"""
-        if os.path.exists(self.data_file):
+        """Charge les stats depuis la base"""
+        try:
+            return {"serveur": self.db_serveur.get("serveur", {"messages": 0, "commandes": 0})}
+        except Exception as e:
+            print(f"❌ Erreur chargement stats : {e}")
+            return {"serveur": {"messages": 0, "commandes": 0}}
+    
+    def load_membres(self):
+        """Charge les compteurs membres (mmap), ou les reprend de l'ancienne collection"""
+        try:
             try:
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except:
-                return {"serveur": {"messages": 0, "commandes": 0}, "membres": {}}
-        return {"serveur": {"messages": 0, "commandes": 0}, "membres": {}}
+                if self.membres.load():
+                    return
+            except (OSError, ValueError) as e:
+                # Fichier illisible : on le met de côté avant que la prochaine
+                # sauvegarde ne l'écrase, puis on repart de l'ancienne collection
+                chemin = self.membres.chemin
+                sauvegarde = f"{chemin}.{int(time.time())}.corrompu"
+                os.replace(chemin, sauvegarde)
+                self.membres = CompteursMembres(chemin, CRITERES)
+                print(f"❌ Compteurs membres illisibles ({e}) : fichier déplacé vers {sauvegarde}")
+            
+            anciens = self.db_membres.items()
+            if not anciens:
+                return
+            for user_id, valeurs in anciens:
+                self.membres.definir(int(user_id), valeurs)
+            self.membres.preparer_sauvegarde()()
+            self.db_membres.clear()
+            print(f"📥 {len(anciens)} membres convertis au format binaire")
+        except Exception as e:
+            print(f"❌ Erreur chargement compteurs membres : {e}")
+    
+    def load_activite(self):
+        """Charge les anneaux d'activité (les membres inactifs depuis 30 jours sont ignorés)"""
+        try:
+            _, jour, _ = tranches()
+            for cle, donnees in self.db_activite.items():
+                if cle == "serveur":
+                    self.activite_serveur = {
+                        nom: Activite.from_dict(anneaux, HEURES_SERVEUR)
+                        for nom, anneaux in donnees.items()
+                    }
+                    continue
+                
+                activite = Activite.from_dict(donnees)
+                if activite.jours.fin > jour - JOURS:
+                    self.activite[int(cle)] = activite
+                    self.actifs.deplacer(None, activite.derniere_heure)
+        except Exception as e:
+            print(f"❌ Erreur chargement activité : {e}")
     
     def save_data(self):
-        """Sauvegarde les stats"""
-        os.makedirs("data", exist_ok=True)
+        """Sauvegarde les totaux serveur et uniquement les membres modifiés"""
         try:
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(self.stats, f, indent=2, ensure_ascii=False)
+            ecriture = self.membres.preparer_sauvegarde()
+            if ecriture:
+                self.bot.stockage.soumettre(ecriture)
+            
+            with self.bot.stockage.lot():
+                self.db_serveur.set_differe("serveur", self.stats["serveur"])
+                self.db_activite.set_differe("serveur", {
+                    nom: activite.to_dict() for nom, activite in self.activite_serveur.items()
+                })
+                for user_id in self.membres_modifies:
+                    if user_id in self.activite:
+                        self.db_activite.set_differe(user_id, self.activite[user_id].to_dict())
+            self.membres_modifies.clear()
         except Exception as e:
             print(f"❌ Erreur sauvegarde stats : {e}")
     
+    def marquer_modifie(self, user_id=None):
+        """Signale un changement en mémoire, sauvegarde si le seuil est atteint"""
+        self.modifie = True
+        if user_id is not None:
+            self.membres_modifies.add(user_id)
+        self.changements += 1
+        if self.changements >= STATS_SEUIL_CHANGEMENTS:
+            self.flush()
+    
+    def appliquer_reactions(self):
+        """Fusionne les deltas de réactions dans les compteurs et le classement"""
+        if not self.reactions_en_attente:
+            return
+        en_attente, self.reactions_en_attente = self.reactions_en_attente, defaultdict(int)
+        
+        for user_id, delta in en_attente.items():
+            if not delta or (delta < 0 and user_id not in self.membres):
+                continue
+            ancien = self.membres.get(user_id, "reactions")
+            nouveau = self.membres.ajouter(user_id, "reactions", delta)
+            self.classements["reactions"].deplacer(user_id, ancien, nouveau)
+    
+    def flush(self):
+        """Écrit les stats sur disque si des changements sont en attente"""
+        if not self.modifie:
+            return
+        self.appliquer_reactions()
+        self.save_data()
+        self.modifie = False
+        self.changements = 0
+    
+    async def cog_unload(self):
+        """Arrête la sauvegarde périodique et écrit les changements restants"""
+        self.sauvegarde_auto.cancel()
+        self.flush()
+    
+    @tasks.loop(seconds=STATS_INTERVALLE_SAUVEGARDE)
+    async def sauvegarde_auto(self):
+        """Sauvegarde périodique des stats modifiées"""
+        self.flush()
+    
     @commands.Cog.listener()
     async def on_message(self, message):
         if message.author.bot:
@@ -36,40 +183,94 @@ class Statistiques(commands.Cog):
         
         # Stats serveur
         self.stats["serveur"]["messages"] += 1
+        self.activite_serveur["messages"].enregistrer()
         
         # Stats membre
-        user_id = str(message.author.id)
-        if user_id not in self.stats["membres"]:
-            self.stats["membres"][user_id] = {
-                "messages": 0,
-                "commandes": 0,
-                "reactions": 0
-            }
+        user_id = message.author.id
+        nouveau = self.membres.ajouter(user_id, "messages")
+        self.classements["messages"].deplacer(user_id, nouveau - 1, nouveau)
         
-        self.stats["membres"][user_id]["messages"] += 1
-        self.save_data()  # ✅ SAUVEGARDE AUTO
+        # Activité du membre par tranche horaire
+        activite = self.activite.get(user_id)
+        if activite is None:
+            activite = self.activite[user_id] = Activite()
+            heure_precedente = None
+        else:
+            heure_precedente = activite.derniere_heure
+        activite.enregistrer()
+        self.actifs.deplacer(heure_precedente, activite.derniere_heure)
+        
+        self.marquer_modifie(user_id)
     
     @commands.Cog.listener()
     async def on_interaction(self, interaction):
         if interaction.type == discord.InteractionType.application_command:
             self.stats["serveur"]["commandes"] += 1
+            self.activite_serveur["commandes"].enregistrer()
             
-            user_id = str(interaction.user.id)
-            if user_id in self.stats["membres"]:
-                self.stats["membres"][user_id]["commandes"] += 1
-            
-            self.save_data()  # ✅ SAUVEGARDE AUTO
+            user_id = interaction.user.id
+            if user_id in self.membres:
+                nouveau = self.membres.ajouter(user_id, "commandes")
+                self.classements["commandes"].deplacer(user_id, nouveau - 1, nouveau)
+                self.marquer_modifie(user_id)
+            else:
+                self.marquer_modifie()
+    
+    def compter_reaction(self, payload, delta):
+        if payload.guild_id is None or payload.user_id == self.bot.user.id:
+            return
+        if payload.member is not None and payload.member.bot:
+            return
+        
+        self.reactions_en_attente[payload.user_id] += delta
+        self.marquer_modifie()
+    
+    @commands.Cog.listener()
+    async def on_raw_reaction_add(self, payload):
+        self.compter_reaction(payload, 1)
+    
+    @commands.Cog.listener()
+    async def on_raw_reaction_remove(self, payload):
+        self.compter_reaction(payload, -1)
     
     @app_commands.command(name="stats", description="Voir les statistiques")
     @app_commands.describe(
         type="Type de statistiques",
-        membre="Membre ciblé (optionnel)"
+        membre="Membre ciblé (optionnel)",
+        periode="Période (optionnel, sinon depuis le début)",
+        critere="Critère du classement (messages par défaut)"
     )
     @app_commands.choices(type=[
         app_commands.Choice(name="Serveur", value="serveur"),
-        app_commands.Choice(name="Membre", value="membre")
+        app_commands.Choice(name="Membre", value="membre"),
+        app_commands.Choice(name="Classement", value="classement")
+    ])
+    @app_commands.choices(critere=[
+        app_commands.Choice(name="Messages", value="messages"),
+        app_commands.Choice(name="Commandes", value="commandes"),
+        app_commands.Choice(name="Réactions", value="reactions")
     ])
-    async def stats(self, interaction: discord.Interaction, type: app_commands.Choice[str], membre: discord.Member = None):
+    @app_commands.choices(periode=[
+        app_commands.Choice(name="24 heures", value="24h"),
+        app_commands.Choice(name="7 jours", value="7j"),
+        app_commands.Choice(name="30 jours", value="30j")
+    ])
+    async def stats(
+        self,
+        interaction: discord.Interaction,
+        type: app_commands.Choice[str],
+        membre: discord.Member = None,
+        periode: app_commands.Choice[str] = None,
+        critere: app_commands.Choice[str] = None
+    ):
+        self.appliquer_reactions()
+        
+        if type.value == "classement":
+            return await self.stats_classement(interaction, critere.value if critere else "messages")
+        
+        if periode:
+            return await self.stats_periode(interaction, type.value, membre, periode)
+        
         if type.value == "serveur":
             embed = discord.Embed(
                 title="📊 Statistiques du Serveur",
@@ -90,7 +291,7 @@ class Statistiques(commands.Cog):
             
             embed.add_field(
                 name="👥 Membres Actifs",
-                value=f"`{len(self.stats['membres'])}`",
+                value=f"`{len(self.membres)}`",
                 inline=True
             )
             
@@ -98,9 +299,9 @@ class Statistiques(commands.Cog):
         
         elif type.value == "membre":
             target = membre or interaction.user
-            user_id = str(target.id)
+            stats = self.membres.membre(target.id)
             
-            if user_id not in self.stats["membres"]:
+            if stats is None:
                 embed = discord.Embed(
                     title="❌ Aucune Donnée",
                     description=f"{target.mention} n'a pas encore d'activité enregistrée.",
@@ -108,8 +309,6 @@ class Statistiques(commands.Cog):
                 )
                 return await interaction.response.send_message(embed=embed, ephemeral=True)
             
-            stats = self.stats["membres"][user_id]
-            
             embed = discord.Embed(
                 title=f"📊 Statistiques de {target.display_name}",
                 color=discord.Color.green()
@@ -117,11 +316,103 @@ class Statistiques(commands.Cog):
             
             embed.add_field(name="💬 Messages", value=f"`{stats['messages']}`", inline=True)
             embed.add_field(name="⚡ Commandes", value=f"`{stats['commandes']}`", inline=True)
-            embed.add_field(name="😊 Réactions", value=f"`{stats.get('reactions', 0)}`", inline=True)
+            embed.add_field(name="😊 Réactions", value=f"`{stats['reactions']}`", inline=True)
             
             embed.set_thumbnail(url=target.display_avatar.url)
             
             await interaction.response.send_message(embed=embed)
+    
+    async def stats_classement(self, interaction, critere, nombre=10):
+        """Top N lu dans le classement maintenu en continu"""
+        titres = {
+            "messages": "💬 Messages",
+            "commandes": "⚡ Commandes",
+            "reactions": "😊 Réactions"
+        }
+        classement = self.classements[critere]
+        top = classement.top(nombre)
+        
+        if not top:
+            embed = discord.Embed(
+                title="❌ Aucune Donnée",
+                description="Aucune activité enregistrée pour ce critère.",
+                color=discord.Color.red()
+            )
+            return await interaction.response.send_message(embed=embed, ephemeral=True)
+        
+        medailles = {1: "🥇", 2: "🥈", 3: "🥉"}
+        lignes = [
+            f"{medailles.get(position, f'`#{position}`')} <@{user_id}> — `{score}`"
+            for position, (user_id, score) in enumerate(top, start=1)
+        ]
+        
+        embed = discord.Embed(
+            title=f"🏆 Classement — {titres[critere]}",
+            description="\n".join(lignes),
+            color=discord.Color.gold()
+        )
+        
+        rang = classement.rang(interaction.user.id)
+        if rang:
+            embed.set_footer(text=f"Votre rang : #{rang} sur {len(classement)}")
+        
+        await interaction.response.send_message(embed=embed)
+    
+    async def stats_periode(self, interaction, type_stats, membre, periode):
+        """Statistiques sur une période, lues dans les agrégats précalculés"""
+        if type_stats == "serveur":
+            embed = discord.Embed(
+                title=f"📊 Statistiques du Serveur — {periode.name}",
+                color=discord.Color.blue()
+            )
+            
+            embed.add_field(
+                name="💬 Messages",
+                value=f"`{self.activite_serveur['messages'].total(periode.value)}`",
+                inline=True
+            )
+            embed.add_field(
+                name="⚡ Commandes",
+                value=f"`{self.activite_serveur['commandes'].total(periode.value)}`",
+                inline=True
+            )
+            embed.add_field(
+                name="👥 Membres Actifs",
+                value=f"`{self.actifs.actifs(periode.value)}`",
+                inline=True
+            )
+            
+            heure, total = self.activite_serveur["messages"].pic_horaire()
+            if total:
+                debut = datetime.fromtimestamp(heure * 3600)
+                embed.add_field(
+                    name="🔥 Heure la plus active (24h)",
+                    value=f"{debut.strftime('%d/%m %Hh')} — `{total}` messages",
+                    inline=False
+                )
+            
+            return await interaction.response.send_message(embed=embed)
+        
+        target = membre or interaction.user
+        activite = self.activite.get(target.id)
+        messages = activite.total(periode.value) if activite else 0
+        
+        if not messages:
+            embed = discord.Embed(
+                title="❌ Aucune Donnée",
+                description=f"{target.mention} n'a pas d'activité sur cette période.",
+                color=discord.Color.red()
+            )
+            return await interaction.response.send_message(embed=embed, ephemeral=True)
+        
+        embed = discord.Embed(
+            title=f"📊 {target.display_name} — {periode.name}",
+            color=discord.Color.green()
+        )
+        embed.add_field(name="💬 Messages", value=f"`{messages}`", inline=True)
+        embed.set_thumbnail(url=target.display_avatar.url)
+        
+        await interaction.response.send_message(embed=embed)
 
 async def setup(bot):
     await bot.add_cog(Statistiques(bot))
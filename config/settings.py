@@ -70,3 +70,31 @@ POSTES_DISPONIBLES = {
 # 🏛️ ORGANIGRAMME GOUVERNEMENTAL
 # ========================================
 CHANNEL_ORGANIGRAMME = 1462916585793786062  # Salon de l'organigramme
+
+# ========================================
+# 📊 STATISTIQUES
+# ========================================
+STATS_INTERVALLE_SAUVEGARDE = int(os.getenv('STATS_INTERVALLE_SAUVEGARDE', 60))  # Secondes entre deux écritures
+STATS_SEUIL_CHANGEMENTS = int(os.getenv('STATS_SEUIL_CHANGEMENTS', 500))          # Écriture anticipée après N changements
+
+# ========================================
+# 🚀 DÉMARRAGE
+# ========================================
+PRECHARGEMENT_APRES_READY = os.getenv('PRECHARGEMENT_APRES_READY', '1') == '1'  # Imports lourds en arrière-plan
+
+# ========================================
+# 📨 ENVOIS
+# ========================================
+ENVOIS_INTERVALLE_RAPPORT = int(os.getenv('ENVOIS_INTERVALLE_RAPPORT', 300))  # Secondes entre deux rapports des files d'envoi
+
+# ========================================
+# 📈 GRAPHIQUES
+# ========================================
+GRAPHIQUES_PROCESSUS = int(os.getenv('GRAPHIQUES_PROCESSUS', 2))  # Processus de rendu matplotlib
+GRAPHIQUES_CACHE_TAILLE = int(os.getenv('GRAPHIQUES_CACHE_TAILLE', 16))       # Images gardées en cache
+GRAPHIQUES_CACHE_DISQUE = os.getenv('GRAPHIQUES_CACHE_DISQUE', '0') == '1'    # Cache aussi écrit sur disque
+
+# ========================================
+# 💰 BUDGET
+# ========================================
+BUDGET_INTERVALLE_INSTANTANE = int(os.getenv('BUDGET_INTERVALLE_INSTANTANE', 500))  # Transactions entre deux instantanés
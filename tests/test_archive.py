@@ -0,0 +1,68 @@
+"""
+Archive mensuelle compressée (utils/archive.py)
+
+    python -m unittest discover tests
+"""
+import gzip
+import json
+import os
+import tempfile
+import unittest
+
+from utils.archive import ArchiveMensuelle
+
+
+def elements(debut, nombre):
+    return [{"date": "2026-03-05T10:00:00", "numero": i} for i in range(debut, debut + nombre)]
+
+
+class TestArchiveMensuelle(unittest.TestCase):
+    def setUp(self):
+        self.dossier = tempfile.TemporaryDirectory()
+        self.chemin = os.path.join(self.dossier.name, "2026-03.jsonl.gz")
+
+    def tearDown(self):
+        self.dossier.cleanup()
+
+    def numeros(self, archive):
+        return [element["numero"] for element in archive.lire("2026-03")]
+
+    def test_ajouts_successifs(self):
+        archive = ArchiveMensuelle(self.dossier.name)
+        archive.ajouter(elements(0, 3))
+        archive.ajouter(elements(3, 2))
+        self.assertEqual(self.numeros(archive), list(range(5)))
+
+    def test_fin_tronquee_puis_ajout(self):
+        archive = ArchiveMensuelle(self.dossier.name)
+        archive.ajouter(elements(0, 50))
+        taille = os.path.getsize(self.chemin)
+        archive.ajouter(elements(50, 50))
+
+        # Arrêt brutal pendant le second ajout : son membre gzip est incomplet
+        with open(self.chemin, 'r+b') as f:
+            f.truncate(os.path.getsize(self.chemin) - 20)
+        self.assertEqual(self.numeros(ArchiveMensuelle(self.dossier.name))[:50], list(range(50)))
+
+        # Après redémarrage, le premier ajout coupe le membre incomplet
+        archive = ArchiveMensuelle(self.dossier.name)
+        archive.ajouter(elements(100, 5))
+        self.assertEqual(self.numeros(archive), list(range(50)) + list(range(100, 105)))
+        self.assertGreater(os.path.getsize(self.chemin), taille)
+
+    def test_membre_incomplet_au_milieu(self):
+        # Segment écrit avant la réparation : un membre complet suit un membre coupé
+        archive = ArchiveMensuelle(self.dossier.name)
+        archive.ajouter(elements(0, 50))
+        archive.ajouter(elements(50, 50))
+        with open(self.chemin, 'r+b') as f:
+            f.truncate(os.path.getsize(self.chemin) - 20)
+        with gzip.open(self.chemin, 'at', encoding='utf-8') as f:
+            f.write(json.dumps(elements(100, 1)[0]) + "\n")
+
+        # La lecture garde ce qui précède, sans lever d'exception
+        self.assertEqual(self.numeros(archive)[:50], list(range(50)))
+
+
+if __name__ == "__main__":
+    unittest.main()
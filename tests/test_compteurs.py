@@ -0,0 +1,88 @@
+"""
+Format binaire des compteurs membres (utils/compteurs.py)
+
+    python -m unittest discover tests
+"""
+import os
+import struct
+import tempfile
+import unittest
+
+from utils.compteurs import EN_TETE, SIGNATURE, VERSION, CompteursMembres
+
+CHAMPS = ("messages", "commandes", "reactions")
+
+
+class TestCompteursMembres(unittest.TestCase):
+    def setUp(self):
+        self.dossier = tempfile.TemporaryDirectory()
+        self.chemin = os.path.join(self.dossier.name, "membres.bin")
+
+    def tearDown(self):
+        self.dossier.cleanup()
+
+    def sauvegarder(self, compteurs):
+        ecriture = compteurs.preparer_sauvegarde()
+        if ecriture:
+            ecriture()
+
+    def recharger(self):
+        compteurs = CompteursMembres(self.chemin, CHAMPS)
+        self.assertTrue(compteurs.load())
+        return compteurs
+
+    def test_fichier_absent(self):
+        self.assertFalse(CompteursMembres(self.chemin, CHAMPS).load())
+
+    def test_aller_retour(self):
+        compteurs = CompteursMembres(self.chemin, CHAMPS)
+        for membre_id in range(10**17, 10**17 + 1500):
+            compteurs.ajouter(membre_id, "messages", membre_id % 7)
+        compteurs.definir(42, {"messages": 3, "commandes": 2, "reactions": 1})
+        self.sauvegarder(compteurs)  # Réécriture complète (capacité 2048)
+
+        # Écriture sur place des seules cases modifiées, dont un nouveau membre
+        compteurs.ajouter(42, "reactions", 5)
+        compteurs.ajouter(7, "commandes")
+        self.sauvegarder(compteurs)
+
+        relu = self.recharger()
+        self.assertEqual(len(relu), len(compteurs))
+        self.assertEqual(relu.membre(42), {"messages": 3, "commandes": 2, "reactions": 6})
+        self.assertEqual(relu.membre(7), {"messages": 0, "commandes": 1, "reactions": 0})
+        for champ in CHAMPS:
+            self.assertEqual(relu.valeurs(champ), compteurs.valeurs(champ))
+
+    def test_en_tete_refuse(self):
+        compteurs = CompteursMembres(self.chemin, CHAMPS)
+        compteurs.ajouter(1, "messages")
+        self.sauvegarder(compteurs)
+
+        with open(self.chemin, 'r+b') as f:
+            f.write(EN_TETE.pack(b"AUTRECHO", VERSION, 1, 1024))
+        with self.assertRaises(ValueError):
+            CompteursMembres(self.chemin, CHAMPS).load()
+
+        with open(self.chemin, 'r+b') as f:
+            f.write(EN_TETE.pack(SIGNATURE, VERSION + 1, 1, 1024))
+        with self.assertRaises(ValueError):
+            CompteursMembres(self.chemin, CHAMPS).load()
+
+    def test_fichier_tronque(self):
+        compteurs = CompteursMembres(self.chemin, CHAMPS)
+        compteurs.ajouter(1, "messages")
+        self.sauvegarder(compteurs)
+
+        with open(self.chemin, 'r+b') as f:
+            f.truncate(EN_TETE.size + 100)
+        with self.assertRaises(ValueError):
+            CompteursMembres(self.chemin, CHAMPS).load()
+
+        with open(self.chemin, 'wb') as f:
+            f.write(struct.pack("<8s", SIGNATURE))
+        with self.assertRaises(ValueError):
+            CompteursMembres(self.chemin, CHAMPS).load()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+"""
+Compteurs d'activité par tranches de temps (heure, jour, semaine)
+"""
+import time
+from array import array
+
+# Tailles des anneaux : la mémoire par membre reste fixe quelle que soit l'ancienneté
+HEURES_MEMBRE = 24
+HEURES_SERVEUR = 24 * 7
+JOURS = 30
+SEMAINES = 12
+
+# Périodes proposées par /stats : (anneau utilisé, nombre de tranches)
+PERIODES = {
+    "24h": ("heures", 24),
+    "7j": ("jours", 7),
+    "30j": ("jours", 30),
+}
+
+
+def tranches(horodatage=None):
+    """Index absolus (heure, jour, semaine) d'un horodatage UNIX"""
+    if horodatage is None:
+        horodatage = time.time()
+    heure = int(horodatage // 3600)
+    jour = heure // 24
+    # Le 01/01/1970 était un jeudi : +3 pour commencer les semaines le lundi
+    semaine = (jour + 3) // 7
+    return heure, jour, semaine
+
+
+class Anneau:
+    """Tranches de taille fixe indexées par leur numéro absolu, les plus anciennes sont recyclées"""
+    __slots__ = ("valeurs", "fin")
+
+    def __init__(self, taille, valeurs=None, fin=0):
+        if valeurs and len(valeurs) == taille:
+            self.valeurs = array('I', valeurs)
+        else:
+            self.valeurs = array('I', bytes(4 * taille))
+        self.fin = fin  # Index absolu de la tranche la plus récente
+
+    def _avancer(self, index):
+        taille = len(self.valeurs)
+        if index - self.fin >= taille:
+            self.valeurs = array('I', bytes(4 * taille))
+        else:
+            for i in range(self.fin + 1, index + 1):
+                self.valeurs[i % taille] = 0
+        self.fin = index
+
+    def ajouter(self, index, n=1):
+        if index > self.fin:
+            self._avancer(index)
+        elif index <= self.fin - len(self.valeurs):
+            return  # Trop ancien pour l'anneau
+        self.valeurs[index % len(self.valeurs)] += n
+
+    def valeur(self, index):
+        taille = len(self.valeurs)
+        if self.fin - taille < index <= self.fin:
+            return self.valeurs[index % taille]
+        return 0
+
+    def somme(self, index, nombre):
+        """Somme des `nombre` dernières tranches jusqu'à `index` inclus"""
+        nombre = min(nombre, len(self.valeurs))
+        return sum(self.valeur(i) for i in range(index - nombre + 1, index + 1))
+
+    def to_dict(self):
+        return {"v": list(self.valeurs), "fin": self.fin}
+
+    @classmethod
+    def from_dict(cls, taille, donnees):
+        return cls(taille, donnees.get("v"), donnees.get("fin", 0))
+
+
+class Activite:
+    """Activité d'un membre ou du serveur : tranches horaires agrégées en jours et semaines"""
+    __slots__ = ("heures", "jours", "semaines")
+
+    def __init__(self, taille_heures=HEURES_MEMBRE, heures=None, jours=None, semaines=None):
+        self.heures = heures or Anneau(taille_heures)
+        self.jours = jours or Anneau(JOURS)
+        self.semaines = semaines or Anneau(SEMAINES)
+
+    def enregistrer(self, horodatage=None, n=1):
+        """Ajoute n événements : chaque agrégat est tenu à jour en O(1)"""
+        heure, jour, semaine = tranches(horodatage)
+        self.heures.ajouter(heure, n)
+        self.jours.ajouter(jour, n)
+        self.semaines.ajouter(semaine, n)
+
+    def total(self, periode, horodatage=None):
+        """Total sur une période de PERIODES ("24h", "7j", "30j")"""
+        heure, jour, _ = tranches(horodatage)
+        anneau, nombre = PERIODES[periode]
+        if anneau == "heures":
+            return self.heures.somme(heure, nombre)
+        return self.jours.somme(jour, nombre)
+
+    def pic_horaire(self, horodatage=None, nombre=24):
+        """(heure absolue, total) de l'heure la plus active parmi les dernières"""
+        heure, _, _ = tranches(horodatage)
+        return max(
+            ((h, self.heures.valeur(h)) for h in range(heure - nombre + 1, heure + 1)),
+            key=lambda x: x[1]
+        )
+
+    @property
+    def derniere_heure(self):
+        return self.heures.fin
+
+    def to_dict(self):
+        return {"h": self.heures.to_dict(), "j": self.jours.to_dict(), "s": self.semaines.to_dict()}
+
+    @classmethod
+    def from_dict(cls, donnees, taille_heures=HEURES_MEMBRE):
+        return cls(
+            taille_heures,
+            Anneau.from_dict(taille_heures, donnees.get("h", {})),
+            Anneau.from_dict(JOURS, donnees.get("j", {})),
+            Anneau.from_dict(SEMAINES, donnees.get("s", {}))
+        )
+
+
+def _deplacer(compteurs, ancien, nouveau):
+    if ancien == nouveau:
+        return
+    if ancien in compteurs:
+        compteurs[ancien] -= 1
+        if not compteurs[ancien]:
+            del compteurs[ancien]
+    compteurs[nouveau] = compteurs.get(nouveau, 0) + 1
+
+
+class SuiviActifs:
+    """
+    Nombre de membres actifs sur une période, sans parcourir les membres :
+    on compte combien de membres ont chaque heure (et chaque jour) comme
+    dernière activité.
+    """
+
+    def __init__(self):
+        self.par_heure = {}
+        self.par_jour = {}
+
+    def deplacer(self, ancienne_heure, heure):
+        """Un membre actif à `heure` quitte sa précédente heure d'activité (None s'il est nouveau)"""
+        ancien_jour = None if ancienne_heure is None else ancienne_heure // 24
+        _deplacer(self.par_heure, ancienne_heure, heure)
+        _deplacer(self.par_jour, ancien_jour, heure // 24)
+
+    def actifs(self, periode, horodatage=None):
+        """Membres actifs sur une période de PERIODES"""
+        heure, jour, _ = tranches(horodatage)
+        anneau, nombre = PERIODES[periode]
+
+        # Les tranches trop anciennes ne servent plus à aucune période
+        for ancienne in [h for h in self.par_heure if h <= heure - HEURES_MEMBRE]:
+            del self.par_heure[ancienne]
+        for ancien in [j for j in self.par_jour if j <= jour - JOURS]:
+            del self.par_jour[ancien]
+
+        if anneau == "heures":
+            return sum(n for h, n in self.par_heure.items() if h > heure - nombre)
+        return sum(n for j, n in self.par_jour.items() if j > jour - nombre)
@@ -0,0 +1,199 @@
+"""
+Archive froide : fichiers JSONL compressés par mois, en ajout seul
+"""
+import gzip
+import io
+import json
+import os
+import threading
+import zlib
+from datetime import datetime
+
+TAILLE_BLOC = 64 * 1024
+
+
+def membres_gzip(f):
+    """
+    (position de fin, contenu décompressé) de chaque membre gzip complet d'un
+    fichier ouvert en binaire (au début). S'arrête au premier membre incomplet
+    ou illisible : un ajout interrompu par un arrêt brutal.
+    """
+    position = 0
+    decompresseur = zlib.decompressobj(wbits=31)
+    morceaux = []
+    reste = b""
+    while True:
+        bloc = reste or f.read(TAILLE_BLOC)
+        reste = b""
+        if not bloc:
+            return
+        try:
+            morceaux.append(decompresseur.decompress(bloc))
+        except zlib.error:
+            return
+        position += len(bloc)
+        if decompresseur.eof:
+            # Fin d'un membre : les octets non consommés commencent le suivant
+            reste = decompresseur.unused_data
+            position -= len(reste)
+            yield position, b"".join(morceaux)
+            morceaux = []
+            decompresseur = zlib.decompressobj(wbits=31)
+
+
+class ArchiveMensuelle:
+    """
+    Un segment `AAAA-MM.jsonl.gz` par mois (selon `champ_date`, une date ISO).
+    Chaque ajout écrit un nouveau membre gzip à la fin du segment : rien n'est
+    jamais réécrit, sauf un membre final interrompu par un arrêt brutal, coupé
+    avant le premier ajout suivant (sinon tout le mois deviendrait illisible). Un petit index par segment (`AAAA-MM.index.json`) liste les
+    valeurs des `champs_index` présentes, pour sauter les mois sans résultat.
+
+    Les recherches lisent les segments un par un, du plus récent au plus
+    ancien, et s'arrêtent dès que la limite est atteinte. Elles peuvent tourner
+    pendant un ajout : seuls les membres gzip complets au moment de la lecture
+    (taille relevée sous le verrou des ajouts) sont décompressés.
+    """
+
+    def __init__(self, dossier, champ_date="date", champs_index=()):
+        self.dossier = dossier
+        self.champ_date = champ_date
+        self.champs_index = champs_index
+        self._verrou = threading.Lock()  # Un ajout à la fois, tailles des segments cohérentes
+        self._verifies = set()  # Segments dont la fin a été vérifiée depuis le démarrage
+
+    def _chemin(self, mois, extension="jsonl.gz"):
+        return os.path.join(self.dossier, f"{mois}.{extension}")
+
+    def mois(self):
+        """Mois archivés, du plus récent au plus ancien"""
+        if not os.path.isdir(self.dossier):
+            return []
+        return sorted(
+            (nom[:-len(".jsonl.gz")] for nom in os.listdir(self.dossier) if nom.endswith(".jsonl.gz")),
+            reverse=True
+        )
+
+    # ========================================
+    # ✍️ AJOUT
+    # ========================================
+
+    def ajouter(self, elements):
+        """Ajoute des éléments (dicts) à leurs segments (à appeler hors de la boucle)"""
+        par_mois = {}
+        for element in elements:
+            par_mois.setdefault(element[self.champ_date][:7], []).append(element)
+
+        os.makedirs(self.dossier, exist_ok=True)
+        with self._verrou:
+            for mois, lot in par_mois.items():
+                if mois not in self._verifies:
+                    self._reparer(mois)
+                    self._verifies.add(mois)
+                lignes = "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in lot)
+                try:
+                    with gzip.open(self._chemin(mois), 'at', encoding='utf-8') as f:
+                        f.write(lignes)
+                except BaseException:
+                    # Disque plein... : le membre est peut-être coupé, à vérifier au prochain ajout
+                    self._verifies.discard(mois)
+                    raise
+                self._indexer(mois, lot)
+
+    def _reparer(self, mois):
+        """Coupe un membre final incomplet, pour que le prochain membre reste lisible"""
+        chemin = self._chemin(mois)
+        if not os.path.exists(chemin):
+            return
+        with open(chemin, 'r+b') as f:
+            fin = 0
+            for fin, _ in membres_gzip(f):
+                pass
+            taille = f.seek(0, os.SEEK_END)
+            if fin < taille:
+                f.truncate(fin)
+                print(f"⚠️ Segment d'archive {mois} : {taille - fin} octet(s) d'un ajout interrompu supprimé(s)")
+
+    def _indexer(self, mois, lot):
+        chemin = self._chemin(mois, "index.json")
+        index = self._lire_index(mois) or {champ: [] for champ in self.champs_index}
+        for champ in self.champs_index:
+            valeurs = set(index.get(champ, []))
+            for element in lot:
+                valeur = element.get(champ)
+                if isinstance(valeur, list):
+                    valeurs.update(valeur)
+                elif valeur is not None:
+                    valeurs.add(valeur)
+            index[champ] = sorted(valeurs)
+        temporaire = f"{chemin}.tmp"
+        with open(temporaire, 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+        os.replace(temporaire, chemin)
+
+    def _lire_index(self, mois):
+        chemin = self._chemin(mois, "index.json")
+        if not os.path.exists(chemin):
+            return None
+        with open(chemin, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    # ========================================
+    # 🔎 RECHERCHE
+    # ========================================
+
+    def rechercher(self, filtre=None, debut=None, fin=None, index=None, limite=10):
+        """
+        Éléments du plus récent au plus ancien.
+        - filtre : fonction élément → bool
+        - debut / fin : datetime bornant `champ_date` (inclus)
+        - index : {champ: valeur} qui doivent figurer dans l'index du segment
+        """
+        resultats = []
+        mois_debut = debut.strftime("%Y-%m") if debut else None
+        mois_fin = fin.strftime("%Y-%m") if fin else None
+
+        for mois in self.mois():
+            if mois_fin and mois > mois_fin:
+                continue
+            if mois_debut and mois < mois_debut:
+                break
+            if index and not self._segment_possible(mois, index):
+                continue
+
+            trouves = []
+            for element in self.lire(mois):
+                date = datetime.fromisoformat(element[self.champ_date])
+                if (debut and date < debut) or (fin and date > fin):
+                    continue
+                if filtre is None or filtre(element):
+                    trouves.append(element)
+
+            trouves.sort(key=lambda e: e[self.champ_date], reverse=True)
+            resultats.extend(trouves[:limite - len(resultats)])
+            if len(resultats) >= limite:
+                break
+        return resultats
+
+    def lire(self, mois):
+        """Éléments d'un segment, dans l'ordre d'ajout (membres gzip complets seulement)"""
+        chemin = self._chemin(mois)
+        with self._verrou:
+            # Les ajouts ne font qu'allonger le fichier : ces octets ne bougeront plus
+            taille = os.path.getsize(chemin)
+        with open(chemin, 'rb') as f:
+            donnees = f.read(taille)
+        # Chaque membre se termine par une fin de ligne : une ligne n'est jamais coupée
+        fin = 0
+        for fin, contenu in membres_gzip(io.BytesIO(donnees)):
+            for ligne in contenu.decode('utf-8').splitlines():
+                yield json.loads(ligne)
+        if fin < taille:
+            # Ajout interrompu (arrêt brutal) : on garde les membres qui le précèdent
+            print(f"⚠️ Segment d'archive {mois} incomplet : {taille - fin} octet(s) ignoré(s)")
+
+    def _segment_possible(self, mois, index):
+        contenu = self._lire_index(mois)
+        if contenu is None:
+            return True  # Pas d'index : on lit le segment
+        return all(valeur in contenu.get(champ, ()) for champ, valeur in index.items())
@@ -0,0 +1,268 @@
+"""
+Journal du budget : agrégats tenus à jour transaction par transaction,
+copie en colonnes pour les rapports, instantanés et compactage
+"""
+import json
+from array import array
+from datetime import datetime
+
+from utils.stockage import IMPORTS_JSON
+
+EPOQUE = datetime(1970, 1, 1)
+
+# Enregistrement du journal qui remet le budget à zéro (les transactions précédentes restent)
+REINITIALISATION = "reinitialisation"
+
+# Chiffres des clés du journal : complétées par des zéros, leur ordre (texte) est celui
+# des positions et les requêtes par intervalle utilisent la clé primaire
+LARGEUR_CLE = 12
+
+
+def cle_journal(position):
+    """Clé d'une position du journal (« 42 » → « 000000000042 »)"""
+    return f"{position:0{LARGEUR_CLE}d}"
+
+
+def importer_budget_json(stockage, donnees):
+    """Import de l'ancien data/budget.json : solde, puis une ligne du journal par transaction"""
+    stockage.collection("budget").set("solde", donnees.get("solde", 0))
+    stockage.collection("budget_transactions").set_many(
+        (cle_journal(numero), transaction)
+        for numero, transaction in enumerate(donnees.get("transactions", []), start=1)
+    )
+
+
+IMPORTS_JSON["budget.json"] = importer_budget_json
+
+
+class AgregatsBudget:
+    """
+    Totaux par type, nombre de transactions, solde cumulé et solde minimum /
+    maximum : quelques scalaires, quelle que soit la taille du registre.
+    `ajouter()` les met à jour en O(1) ; la courbe du solde est recalculée
+    depuis la copie en colonnes (`serie_soldes`) quand un graphique est demandé.
+    """
+    __slots__ = ("entrees", "sorties", "nombre", "solde", "solde_min", "solde_max")
+
+    def __init__(self, transactions=()):
+        self.reconstruire(transactions)
+
+    def reconstruire(self, transactions):
+        self.entrees = 0.0
+        self.sorties = 0.0
+        self.nombre = 0
+        self.solde = 0.0
+        self.solde_min = None
+        self.solde_max = None
+        for transaction in transactions:
+            self.ajouter(transaction)
+
+    def ajouter(self, transaction):
+        montant = transaction["montant"]
+        if transaction["type"] == "entree":
+            self.entrees += montant
+        else:
+            self.sorties += montant
+            montant = -montant
+        self.solde = solde = self.solde + montant
+
+        self.nombre += 1
+        self.solde_min = solde if self.solde_min is None else min(self.solde_min, solde)
+        self.solde_max = solde if self.solde_max is None else max(self.solde_max, solde)
+
+    def etat(self):
+        """État sérialisable (JSON) pour un instantané"""
+        return {champ: getattr(self, champ) for champ in self.__slots__}
+
+    @classmethod
+    def depuis_etat(cls, etat):
+        agregats = cls()
+        for champ in cls.__slots__:
+            setattr(agregats, champ, etat[champ])
+        return agregats
+
+
+class ColonnesBudget:
+    """
+    Copie en colonnes des transactions pour les rapports : horodatages
+    (secondes depuis 1970, heure locale), montants, signes (+1 entrée,
+    -1 sortie) et code de l'auteur. Chaque colonne est un array compact : un
+    ajout est amorti en O(1) et la copie vers NumPy est un simple memcpy.
+    """
+
+    def __init__(self, transactions=()):
+        self.horodatages = array('d')
+        self.montants = array('d')
+        self.signes = array('b')
+        self.auteurs = array('i')
+        self.noms_auteurs = []
+        self._codes = {}
+        for transaction in transactions:
+            self.ajouter(transaction)
+
+    def ajouter(self, transaction):
+        auteur = transaction["auteur"]
+        code = self._codes.get(auteur)
+        if code is None:
+            code = self._codes[auteur] = len(self.noms_auteurs)
+            self.noms_auteurs.append(auteur)
+        date = datetime.fromisoformat(transaction["date"])
+        self.horodatages.append((date - EPOQUE).total_seconds())
+        self.montants.append(transaction["montant"])
+        self.signes.append(1 if transaction["type"] == "entree" else -1)
+        self.auteurs.append(code)
+
+    def tableaux(self):
+        """
+        Copies NumPy des colonnes (à prendre sur la boucle) : le calcul peut
+        ensuite tourner dans un thread pendant que d'autres transactions arrivent
+        """
+        import numpy as np
+        return (
+            np.array(self.horodatages, dtype=np.float64),
+            np.array(self.montants, dtype=np.float64),
+            np.array(self.signes, dtype=np.int8),
+            np.array(self.auteurs, dtype=np.int32),
+        )
+
+    def __len__(self):
+        return len(self.montants)
+
+
+def serie_soldes(tableaux, points=2000):
+    """
+    Courbe du solde cumulé à partir des colonnes (`ColonnesBudget.tableaux()`),
+    réduite à environ `points` points : chaque tranche garde son premier et son
+    dernier point, son minimum et son maximum, pour que les pics restent visibles.
+
+    Retourne (dates ISO, soldes), deux listes simples pour le processus de rendu.
+    """
+    import numpy as np
+
+    horodatages, montants, signes, _ = tableaux
+    soldes = np.cumsum(montants * signes)
+    if len(soldes) > points:
+        bornes = np.linspace(0, len(soldes), max(points // 4, 1) + 1).astype(np.int64)
+        indices = []
+        for debut, fin in zip(bornes[:-1], bornes[1:]):
+            if fin > debut:
+                tranche = soldes[debut:fin]
+                indices += [debut, debut + tranche.argmin(), debut + tranche.argmax(), fin - 1]
+        indices = np.unique(indices)
+        horodatages, soldes = horodatages[indices], soldes[indices]
+    dates = horodatages.astype('datetime64[s]').astype(str)
+    return dates.tolist(), soldes.round(2).tolist()
+
+
+def rapport_periodes(tableaux, noms_auteurs, periode="mois", categorie="type",
+                     nombre=6, max_categories=5):
+    """
+    Regroupe les transactions (`ColonnesBudget.tableaux()`) par période (« semaine » ou « mois ») et par
+    catégorie : « type » (entrées / sorties) ou « auteur » (dépenses de chaque
+    auteur, les moins dépensiers regroupés dans « Autres »). Seules les
+    `nombre` dernières périodes sont gardées.
+
+    Retourne {"periodes": [libellés], "categories": [libellés],
+    "valeurs": [[montant par catégorie] par période], "nets": [solde net par période]}.
+    """
+    import numpy as np
+
+    horodatages, montants, signes, auteurs = tableaux
+    vide = {"periodes": [], "categories": [], "valeurs": [], "nets": []}
+    if not len(montants):
+        return vide
+
+    jours = horodatages.astype('datetime64[s]').astype('datetime64[D]')
+    if periode == "semaine":
+        # Semaines commençant le lundi (le 1970-01-01 était un jeudi)
+        cles = (jours.astype(np.int64) + 3) // 7
+    else:
+        cles = jours.astype('datetime64[M]').astype(np.int64)
+
+    # Les `nombre` dernières périodes seulement
+    uniques = np.unique(cles)[-nombre:]
+    garder = cles >= uniques[0]
+    indices = np.searchsorted(uniques, cles[garder])
+    montants, signes, auteurs = montants[garder], signes[garder], auteurs[garder]
+    nets = np.bincount(indices, weights=montants * signes, minlength=len(uniques))
+
+    if categorie == "auteur":
+        depenses = signes < 0
+        indices, montants, auteurs = indices[depenses], montants[depenses], auteurs[depenses]
+        totaux = np.bincount(auteurs, weights=montants, minlength=len(noms_auteurs))
+        classes = [code for code in np.argsort(-totaux, kind='stable') if totaux[code] > 0]
+        principaux = classes[:max_categories]
+        # Code auteur → colonne du tableau (les autres dans la dernière)
+        colonne = np.full(len(totaux), len(principaux), dtype=np.int64)
+        colonne[principaux] = np.arange(len(principaux))
+        categories = [noms_auteurs[code] for code in principaux]
+        if len(classes) > len(principaux):
+            categories.append("Autres")
+        codes = colonne[auteurs]
+    else:
+        categories = ["Entrées", "Sorties"]
+        codes = (signes < 0).astype(np.int64)
+
+    largeur = max(len(categories), 1)
+    valeurs = np.bincount(
+        indices * largeur + codes, weights=montants, minlength=len(uniques) * largeur
+    ).reshape(len(uniques), largeur)[:, :len(categories)]
+
+    if periode == "semaine":
+        lundis = (uniques * 7 - 3).astype('datetime64[D]')
+        periodes = [f"Sem. {jour.astype(datetime):%d/%m/%y}" for jour in lundis]
+    else:
+        periodes = [f"{mois.astype(datetime):%m/%Y}" for mois in uniques.astype('datetime64[M]')]
+
+    return {
+        "periodes": periodes,
+        "categories": categories,
+        "valeurs": valeurs.round(2).tolist(),
+        "nets": nets.round(2).tolist()
+    }
+
+
+def compacter_journal(stockage, collection, archive, position):
+    """
+    Déplace les enregistrements du journal jusqu'à `position` (incluse) dans
+    `archive`, avec leur position, puis les supprime de la base. À exécuter
+    dans le thread d'écriture (`stockage.soumettre`), à la suite des écritures
+    déjà programmées.
+    """
+    lignes = stockage.executer(
+        "SELECT cle, valeur FROM elements WHERE collection = ? AND cle <= ? ORDER BY cle",
+        (collection.nom, cle_journal(position))
+    ).fetchall()
+    if not lignes:
+        return 0
+    archive.ajouter([dict(json.loads(valeur), position=int(cle)) for cle, valeur in lignes])
+    with stockage.transaction():
+        stockage.executer(
+            "DELETE FROM elements WHERE collection = ? AND cle <= ?",
+            (collection.nom, cle_journal(position))
+        )
+    return len(lignes)
+
+
+def transactions_archivees(archive, debut):
+    """
+    Transactions compactées dont la position suit `debut`, dans l'ordre des
+    positions. Les segments sont lus du plus récent au plus ancien, jusqu'au
+    premier qui contient une position antérieure (ou un enregistrement archivé
+    sans position, forcément antérieur à la dernière réinitialisation).
+    """
+    segments = []
+    for mois in archive.mois():
+        suivantes = []
+        complet = False
+        for enregistrement in archive.lire(mois):
+            if enregistrement.get("position", 0) <= debut:
+                complet = True
+            elif enregistrement["type"] != REINITIALISATION:
+                suivantes.append(enregistrement)
+        segments.append(suivantes)
+        if complet:
+            break
+    transactions = [t for segment in reversed(segments) for t in segment]
+    transactions.sort(key=lambda t: t["position"])
+    return transactions
@@ -0,0 +1,150 @@
+"""
+Classement tenu à jour au fil des événements (top N sans tri complet)
+"""
+import heapq
+from bisect import bisect_left, insort
+
+
+class Classement:
+    """
+    Classement d'un compteur de `CompteursMembres`, sans dict par membre :
+    les scores restent dans la colonne du stockage compact.
+
+    - `comptes` : nombre de membres par valeur distincte, pour les rangs.
+    - `paliers` : cases (indices du stockage) des valeurs les plus hautes,
+      à partir de `plancher`, pour le top. On suit au moins `suivis` membres ;
+      si la tête devient trop grande, les paliers du bas sont oubliés, et si
+      elle s'amenuise, une lecture de la colonne la complète.
+
+    Un déplacement coûte O(1) dans les ensembles, plus une insertion ou
+    suppression dans la liste triée des valeurs en O(p) quand une valeur
+    apparaît ou disparaît (p = nombre de valeurs distinctes, bien plus petit
+    que le nombre de membres).
+    """
+
+    def __init__(self, compteurs, champ, suivis=64):
+        self.compteurs = compteurs
+        self.champ = champ
+        self.suivis = suivis
+        self.comptes = {}
+        self.valeurs = []  # Valeurs distinctes, triées
+        self.nombre = 0
+        self.paliers = {}
+        self.plancher = None  # Plus petite valeur suivie (None : aucune)
+        self.nombre_suivis = 0
+
+        for score in compteurs.colonnes[champ]:
+            if score > 0:
+                self.comptes[score] = self.comptes.get(score, 0) + 1
+        self.valeurs = sorted(self.comptes)
+        self.nombre = sum(self.comptes.values())
+        self._etendre(suivis)
+
+    # ========================================
+    # 🔢 COMPTES PAR VALEUR
+    # ========================================
+
+    def _compter(self, score, delta):
+        compte = self.comptes.get(score, 0) + delta
+        if compte:
+            if score not in self.comptes:
+                insort(self.valeurs, score)
+            self.comptes[score] = compte
+        else:
+            del self.comptes[score]
+            del self.valeurs[bisect_left(self.valeurs, score)]
+
+    # ========================================
+    # 🏅 TÊTE DU CLASSEMENT
+    # ========================================
+
+    def _suivre(self, case, score):
+        self.paliers.setdefault(score, set()).add(case)
+        self.nombre_suivis += 1
+
+    def _oublier(self, case, score):
+        palier = self.paliers[score]
+        palier.discard(case)
+        self.nombre_suivis -= 1
+        if not palier:
+            del self.paliers[score]
+
+    def _etendre(self, cible):
+        """Abaisse le plancher pour suivre au moins `cible` membres (lecture de la colonne)"""
+        total = 0
+        plancher = None
+        for score in reversed(self.valeurs):
+            plancher = score
+            total += self.comptes[score]
+            if total >= cible:
+                break
+        if plancher is None or (self.plancher is not None and plancher >= self.plancher):
+            return
+
+        haut = self.plancher
+        colonne = self.compteurs.colonnes[self.champ]
+        for case in self.compteurs.cases.values():
+            score = colonne[case]
+            if score >= plancher and (haut is None or score < haut):
+                self._suivre(case, score)
+        self.plancher = plancher
+
+    def _reduire(self):
+        """Oublie les paliers du bas tant qu'il reste au moins `suivis` membres suivis"""
+        for score in sorted(self.paliers):
+            taille = len(self.paliers[score])
+            if self.nombre_suivis - taille < self.suivis:
+                self.plancher = score
+                return
+            del self.paliers[score]
+            self.nombre_suivis -= taille
+
+    def deplacer(self, membre, ancien, nouveau):
+        """Replace un membre dont le compteur vient de passer de `ancien` à `nouveau`"""
+        if nouveau == ancien:
+            return
+        case = self.compteurs.cases[membre]
+        if ancien:
+            self._compter(ancien, -1)
+            if self.plancher is not None and ancien >= self.plancher:
+                self._oublier(case, ancien)
+        else:
+            self.nombre += 1
+        if nouveau:
+            self._compter(nouveau, 1)
+            if self.plancher is None:
+                self.plancher = nouveau
+            if nouveau >= self.plancher:
+                self._suivre(case, nouveau)
+        else:
+            self.nombre -= 1
+
+        if self.nombre_suivis > 4 * self.suivis:
+            self._reduire()
+
+    def top(self, n=10):
+        """Liste des (membre, score) des n premiers, du plus haut au plus bas"""
+        if self.nombre_suivis < min(n, self.nombre):
+            self._etendre(max(n, self.suivis))
+
+        ids = self.compteurs.ids
+        resultat = []
+        for score in sorted(self.paliers, reverse=True):
+            restant = n - len(resultat)
+            if restant <= 0:
+                break
+            # À égalité, ordre stable par identifiant
+            for membre in heapq.nsmallest(restant, (ids[case] for case in self.paliers[score])):
+                resultat.append((membre, score))
+        return resultat
+
+    def rang(self, membre):
+        """Rang d'un membre (1 = premier), None s'il n'est pas classé"""
+        score = self.compteurs.get(membre, self.champ)
+        if not score:
+            return None
+        index = bisect_left(self.valeurs, score)
+        return 1 + sum(self.comptes[v] for v in self.valeurs[index + 1:])
+
+    def __len__(self):
+        return self.nombre
@@ -0,0 +1,187 @@
+"""
+Compteurs par membre en tableaux parallèles, persistés dans un fichier binaire
+"""
+import mmap
+import os
+import struct
+from array import array
+
+# En-tête : signature, version, nombre de membres, capacité réservée
+EN_TETE = struct.Struct("<8sIII")
+SIGNATURE = b"CNOISTAT"
+VERSION = 1
+CAPACITE_MIN = 1024
+
+
+class CompteursMembres:
+    """
+    Un index identifiant → case, plus une colonne array('I') par compteur.
+    Un membre coûte ~20 octets de données (au lieu d'un dict de trois entiers
+    indexé par une chaîne) et le fichier se charge par simple copie mémoire.
+
+    Format du fichier (colonnes de `capacite` cases chacune) :
+        en-tête | ids (uint64) | champ 1 (uint32) | champ 2 | ...
+    Les cases modifiées sont réécrites sur place ; le fichier n'est réécrit en
+    entier que lorsque la capacité doit doubler.
+    """
+
+    def __init__(self, chemin, champs=("messages", "commandes", "reactions")):
+        self.chemin = chemin
+        self.champs = champs
+        self.cases = {}
+        self.ids = array('Q')
+        self.colonnes = {champ: array('I') for champ in champs}
+        self.capacite_fichier = 0
+        self.cases_modifiees = set()
+
+    # ========================================
+    # 📖 LECTURE
+    # ========================================
+
+    def load(self):
+        """
+        Charge le fichier via mmap ; retourne False s'il n'existe pas.
+        Lève ValueError si l'en-tête est invalide ou le fichier tronqué.
+        """
+        if not os.path.exists(self.chemin):
+            return False
+        taille = os.path.getsize(self.chemin)
+        if taille < EN_TETE.size:
+            raise ValueError(f"Fichier de compteurs tronqué : {self.chemin}")
+
+        with open(self.chemin, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            signature, version, nombre, capacite = EN_TETE.unpack_from(mm, 0)
+            if signature != SIGNATURE or version != VERSION:
+                raise ValueError(f"Fichier de compteurs invalide : {self.chemin}")
+            if nombre > capacite or taille < EN_TETE.size + (8 + 4 * len(self.champs)) * capacite:
+                raise ValueError(f"Fichier de compteurs tronqué : {self.chemin}")
+
+            vue = memoryview(mm)
+            try:
+                decalage = EN_TETE.size
+                self.ids = array('Q')
+                self.ids.frombytes(vue[decalage:decalage + 8 * nombre])
+                decalage += 8 * capacite
+                for champ in self.champs:
+                    colonne = array('I')
+                    colonne.frombytes(vue[decalage:decalage + 4 * nombre])
+                    self.colonnes[champ] = colonne
+                    decalage += 4 * capacite
+            finally:
+                vue.release()
+
+        self.cases = dict(zip(self.ids, range(nombre)))
+        self.capacite_fichier = capacite
+        self.cases_modifiees.clear()
+        return True
+
+    def __contains__(self, membre_id):
+        return membre_id in self.cases
+
+    def __len__(self):
+        return len(self.ids)
+
+    def get(self, membre_id, champ):
+        case = self.cases.get(membre_id)
+        return 0 if case is None else self.colonnes[champ][case]
+
+    def membre(self, membre_id):
+        """Compteurs d'un membre sous forme de dict (None s'il est inconnu)"""
+        case = self.cases.get(membre_id)
+        if case is None:
+            return None
+        return {champ: colonne[case] for champ, colonne in self.colonnes.items()}
+
+    def valeurs(self, champ):
+        """Dictionnaire {membre: valeur} d'un compteur (pour les index)"""
+        return dict(zip(self.ids, self.colonnes[champ]))
+
+    # ========================================
+    # ✏️ ÉCRITURE EN MÉMOIRE
+    # ========================================
+
+    def case(self, membre_id):
+        """Case d'un membre, créée si besoin"""
+        case = self.cases.get(membre_id)
+        if case is None:
+            case = len(self.ids)
+            self.cases[membre_id] = case
+            self.ids.append(membre_id)
+            for colonne in self.colonnes.values():
+                colonne.append(0)
+        return case
+
+    def ajouter(self, membre_id, champ, delta=1):
+        """Ajoute delta à un compteur (plancher à 0) et retourne la nouvelle valeur"""
+        case = self.case(membre_id)
+        colonne = self.colonnes[champ]
+        colonne[case] = max(colonne[case] + delta, 0)
+        self.cases_modifiees.add(case)
+        return colonne[case]
+
+    def definir(self, membre_id, valeurs):
+        """Remplace les compteurs d'un membre (import)"""
+        case = self.case(membre_id)
+        for champ, colonne in self.colonnes.items():
+            colonne[case] = max(int(valeurs.get(champ, 0)), 0)
+        self.cases_modifiees.add(case)
+
+    # ========================================
+    # 💾 PERSISTANCE
+    # ========================================
+
+    def preparer_sauvegarde(self):
+        """
+        Copie sur la boucle ce qui doit être écrit et retourne la fonction
+        d'écriture à exécuter dans le thread d'écriture (None si rien à faire).
+        """
+        nombre = len(self.ids)
+        if not self.cases_modifiees and nombre <= self.capacite_fichier:
+            return None
+
+        if nombre > self.capacite_fichier:
+            # Croissance : réécriture complète avec une capacité doublée
+            capacite = max(CAPACITE_MIN, self.capacite_fichier)
+            while capacite < nombre:
+                capacite *= 2
+            ids = array('Q', self.ids)
+            colonnes = [array('I', self.colonnes[champ]) for champ in self.champs]
+            self.capacite_fichier = capacite
+            self.cases_modifiees.clear()
+            return lambda: self._ecrire_tout(ids, colonnes, capacite)
+
+        cases = sorted(self.cases_modifiees)
+        lignes = [
+            (case, self.ids[case], [self.colonnes[champ][case] for champ in self.champs])
+            for case in cases
+        ]
+        capacite = self.capacite_fichier
+        self.cases_modifiees.clear()
+        return lambda: self._ecrire_cases(lignes, nombre, capacite)
+
+    def _ecrire_tout(self, ids, colonnes, capacite):
+        temporaire = f"{self.chemin}.tmp"
+        os.makedirs(os.path.dirname(self.chemin) or ".", exist_ok=True)
+        with open(temporaire, 'wb') as f:
+            f.write(EN_TETE.pack(SIGNATURE, VERSION, len(ids), capacite))
+            f.write(ids.tobytes())
+            f.write(bytes(8 * (capacite - len(ids))))
+            for colonne in colonnes:
+                f.write(colonne.tobytes())
+                f.write(bytes(4 * (capacite - len(colonne))))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporaire, self.chemin)
+
+    def _ecrire_cases(self, lignes, nombre, capacite):
+        fd = os.open(self.chemin, os.O_WRONLY)
+        try:
+            debut_colonnes = EN_TETE.size + 8 * capacite
+            for case, membre_id, valeurs in lignes:
+                os.pwrite(fd, struct.pack("<Q", membre_id), EN_TETE.size + 8 * case)
+                for i, valeur in enumerate(valeurs):
+                    os.pwrite(fd, struct.pack("<I", valeur), debut_colonnes + 4 * (i * capacite + case))
+            # L'en-tête en dernier : un nouveau membre n'est visible qu'une fois écrit
+            os.pwrite(fd, EN_TETE.pack(SIGNATURE, VERSION, nombre, capacite), 0)
+        finally:
+            os.close(fd)
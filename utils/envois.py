@@ -0,0 +1,190 @@
+"""
+File d'envois Discord : travailleurs concurrents, priorités et seaux de limite de débit
+"""
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+
+from utils.moniteur import percentile
+
+
+class FileEnvois:
+    """
+    Les envois sont des coroutines sans argument, exécutées par `travailleurs`
+    tâches en parallèle. Le plus urgent passe d'abord (priorité la plus basse,
+    puis heure prévue la plus ancienne).
+
+    Un « seau » regroupe les envois d'une même route Discord (ex : un salon).
+    Un seul envoi par seau est en cours à la fois : les autres salons avancent
+    pendant que celui-ci attend sa limite de débit, au lieu de bloquer la file.
+
+    Une « clé » fusionne les envois redondants : tant qu'un envoi n'a pas
+    commencé, en ajouter un autre avec la même clé le remplace (seul le
+    dernier état part). Une erreur reconnue par `transitoire` est retentée
+    jusqu'à `tentatives` fois, avec un délai doublé à chaque essai.
+
+    Le retard entre l'heure prévue et l'envoi effectif est mesuré.
+    """
+
+    def __init__(self, nom, travailleurs=4, historique=1000,
+                 tentatives=1, delai_reessai=1.0, transitoire=None):
+        self.nom = nom
+        self.nombre_travailleurs = travailleurs
+        self.tentatives = tentatives
+        self.delai_reessai = delai_reessai
+        self.transitoire = transitoire or (lambda erreur: False)
+        self.retards = deque(maxlen=historique)
+        self.envoyes = 0
+        self.echecs = 0
+        self.fusionnes = 0
+        self.reessais = 0
+        # Depuis le dernier rapport périodique
+        self._retards_periode = []
+        self._compteurs_periode = (0, 0, 0, 0)
+
+        self._tas = []  # (priorité, prévu, ordre, seau, clé, tentative, envoi)
+        self._ordre = itertools.count()
+        self._cles = {}  # clé → ordre de l'envoi en attente qui fait foi
+        self._seaux_occupes = set()
+        self._en_cours = 0
+        self._reessais_prevus = 0
+        self._disponible = asyncio.Event()
+        self._vide = asyncio.Event()
+        self._vide.set()
+        self._travailleurs = []
+
+    def ajouter(self, envoi, priorite=0, seau=None, prevu=None, cle=None):
+        """
+        Programme `envoi` (coroutine sans argument). `prevu` : horodatage UNIX
+        auquel l'envoi aurait dû partir (par défaut maintenant).
+        """
+        prevu = time.time() if prevu is None else prevu
+        self._pousser((priorite, prevu, None, seau, cle, 1, envoi))
+
+    def _pousser(self, entree):
+        if not self._travailleurs:
+            self._demarrer()
+        priorite, prevu, _, seau, cle, tentative, envoi = entree
+        ordre = next(self._ordre)
+        if cle is not None:
+            if cle in self._cles:
+                self.fusionnes += 1
+            self._cles[cle] = ordre
+        heapq.heappush(self._tas, (priorite, prevu, ordre, seau, cle, tentative, envoi))
+        self._vide.clear()
+        self._disponible.set()
+
+    def _reessayer(self, entree):
+        self._reessais_prevus -= 1
+        cle = entree[4]
+        # Un envoi plus récent pour la même clé rend la nouvelle tentative inutile
+        if cle is None or cle not in self._cles:
+            self._pousser(entree)
+        else:
+            self._verifier_vide()
+
+    def _demarrer(self):
+        self._travailleurs = [
+            asyncio.create_task(self._travailler())
+            for _ in range(self.nombre_travailleurs)
+        ]
+
+    def arreter(self):
+        for tache in self._travailleurs:
+            tache.cancel()
+        self._travailleurs = []
+
+    async def vider(self):
+        """Attend que tous les envois programmés soient terminés"""
+        await self._vide.wait()
+
+    def _verifier_vide(self):
+        if not self._tas and not self._en_cours and not self._reessais_prevus:
+            self._vide.set()
+
+    def _suivant(self):
+        """Envoi le plus urgent dont le seau est libre (None s'il n'y en a pas)"""
+        ecartes = []
+        entree = None
+        while self._tas:
+            candidat = heapq.heappop(self._tas)
+            _, _, ordre, seau, cle, _, _ = candidat
+            if cle is not None and self._cles.get(cle) != ordre:
+                continue  # Remplacé par un envoi plus récent
+            if seau is None or seau not in self._seaux_occupes:
+                entree = candidat
+                if cle is not None:
+                    del self._cles[cle]
+                break
+            ecartes.append(candidat)
+        for ecarte in ecartes:
+            heapq.heappush(self._tas, ecarte)
+        return entree
+
+    async def _travailler(self):
+        while True:
+            entree = self._suivant()
+            if entree is None:
+                self._disponible.clear()
+                await self._disponible.wait()
+                continue
+
+            _, prevu, _, seau, _, tentative, envoi = entree
+            if seau is not None:
+                self._seaux_occupes.add(seau)
+            self._en_cours += 1
+            try:
+                await envoi()
+                self.envoyes += 1
+                retard = max(time.time() - prevu, 0.0)
+                self.retards.append(retard)
+                self._retards_periode.append(retard)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if tentative < self.tentatives and self.transitoire(e):
+                    self.reessais += 1
+                    self._reessais_prevus += 1
+                    delai = self.delai_reessai * 2 ** (tentative - 1)
+                    asyncio.get_running_loop().call_later(
+                        delai, self._reessayer, entree[:5] + (tentative + 1, envoi)
+                    )
+                else:
+                    self.echecs += 1
+                    print(f"❌ Erreur envoi ({self.nom}): {e}")
+            finally:
+                self._en_cours -= 1
+                self._seaux_occupes.discard(seau)
+                # Un seau libéré peut débloquer un envoi en attente
+                self._disponible.set()
+                self._verifier_vide()
+
+    def rapport(self):
+        return self._formater(
+            (self.envoyes, self.echecs, self.fusionnes, self.reessais), list(self.retards)
+        )
+
+    def rapport_periode(self):
+        """Rapport de l'activité depuis l'appel précédent (None si la file est restée inactive)"""
+        compteurs = (self.envoyes, self.echecs, self.fusionnes, self.reessais)
+        ecarts = tuple(a - b for a, b in zip(compteurs, self._compteurs_periode))
+        retards, self._retards_periode = self._retards_periode, []
+        self._compteurs_periode = compteurs
+        if not any(ecarts) and not self._tas:
+            return None
+        return self._formater(ecarts, retards)
+
+    def _formater(self, compteurs, retards):
+        envoyes, echecs, fusionnes, reessais = compteurs
+        return (
+            f"📨 {self.nom} : {envoyes} envoi(s), {echecs} échec(s), "
+            f"{fusionnes} fusionné(s), {reessais} nouvel(s) essai(s), "
+            f"{len(self._tas)} en attente, retard "
+            f"p50 {percentile(retards, 50):.2f} s • p95 {percentile(retards, 95):.2f} s • "
+            f"max {max(retards, default=0.0):.2f} s"
+        )
+
+    def __len__(self):
+        return len(self._tas)
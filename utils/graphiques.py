@@ -0,0 +1,252 @@
+"""
+Rendu des graphiques matplotlib dans des processus dédiés (hors de la boucle d'événements)
+"""
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from io import BytesIO
+
+
+def charger_matplotlib():
+    """Import différé de matplotlib (lourd) : une fois par processus de rendu"""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import matplotlib.dates as mdates
+    return plt, mdates
+
+
+# ========================================
+# 🎨 RENDUS (exécutés dans les processus)
+# ========================================
+# Fonctions de module : seules leurs données (listes simples) traversent le pipe,
+# et le PNG revient sous forme de bytes.
+
+def rendu_evolution_budget(dates, soldes, dpi=150):
+    """
+    Courbe du solde cumulé.
+    - dates : dates ISO des transactions, dans l'ordre
+    - soldes : solde cumulé après chaque transaction
+    """
+    plt, mdates = charger_matplotlib()
+
+    if not dates:
+        fig, ax = plt.subplots(figsize=(10, 6))
+        ax.text(0.5, 0.5, 'Aucune donnée disponible',
+                ha='center', va='center', fontsize=16)
+        ax.set_xlim(0, 1)
+        ax.set_ylim(0, 1)
+        ax.axis('off')
+    else:
+        abscisses = [datetime.fromisoformat(date) for date in dates]
+
+        fig, ax = plt.subplots(figsize=(12, 6))
+        ax.plot(abscisses, soldes, marker='o', linewidth=2, markersize=6, color='#5865F2')
+        ax.fill_between(abscisses, soldes, alpha=0.3, color='#5865F2')
+
+        ax.set_xlabel('Date', fontsize=12, fontweight='bold')
+        ax.set_ylabel('Solde (€)', fontsize=12, fontweight='bold')
+        ax.set_title('Évolution du Budget', fontsize=14, fontweight='bold')
+
+        ax.xaxis.set_major_formatter(mdates.DateFormatter('%d/%m'))
+        ax.xaxis.set_major_locator(mdates.AutoDateLocator())
+
+        plt.setp(ax.get_xticklabels(), rotation=45)
+        ax.grid(True, alpha=0.3)
+        fig.tight_layout()
+
+    buffer = BytesIO()
+    fig.savefig(buffer, format='png', dpi=dpi, bbox_inches='tight')
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+def rendu_barres_empilees(periodes, categories, valeurs, dpi=150):
+    """
+    Barres empilées par période.
+    - periodes : libellés des périodes (abscisses)
+    - categories : libellés des catégories (une couleur chacune)
+    - valeurs : [[montant par catégorie] par période]
+    """
+    plt, _ = charger_matplotlib()
+
+    fig, ax = plt.subplots(figsize=(12, 6))
+    bas = [0.0] * len(periodes)
+    for colonne, categorie in enumerate(categories):
+        hauteurs = [ligne[colonne] for ligne in valeurs]
+        ax.bar(periodes, hauteurs, bottom=bas, label=categorie)
+        bas = [b + h for b, h in zip(bas, hauteurs)]
+
+    ax.set_ylabel('Montant (€)', fontsize=12, fontweight='bold')
+    ax.set_title('Budget par période', fontsize=14, fontweight='bold')
+    ax.legend()
+    plt.setp(ax.get_xticklabels(), rotation=45)
+    ax.grid(True, axis='y', alpha=0.3)
+    fig.tight_layout()
+
+    buffer = BytesIO()
+    fig.savefig(buffer, format='png', dpi=dpi, bbox_inches='tight')
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+# ========================================
+# ⚙️ POOL DE PROCESSUS
+# ========================================
+
+def _rien():
+    return None
+
+
+class RenduGraphiques:
+    """
+    Pool de processus créé au premier rendu. Chaque processus importe
+    matplotlib une seule fois ; plusieurs demandes simultanées sont rendues
+    en parallèle (jusqu'à `processus`) sans bloquer la boucle.
+    """
+
+    def __init__(self, processus=2):
+        self.processus = processus
+        self._pool = None
+
+    def _executeur(self):
+        if self._pool is None:
+            # « spawn » : pas de fork d'un processus qui a déjà des threads (SQLite, moniteur)
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.processus,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=charger_matplotlib
+            )
+        return self._pool
+
+    async def rendre(self, fonction, *args):
+        """Exécute `fonction(*args)` dans un processus et retourne le PNG (bytes)"""
+        boucle = asyncio.get_running_loop()
+        try:
+            return await boucle.run_in_executor(self._executeur(), fonction, *args)
+        except BrokenProcessPool:
+            # Un processus est mort (mémoire, signal) : pool inutilisable, recréé à la demande suivante
+            self.fermer()
+            raise
+
+    async def prechauffer(self):
+        """Démarre les processus (et leur import de matplotlib) avant la première demande"""
+        boucle = asyncio.get_running_loop()
+        executeur = self._executeur()
+        # Une tâche vide par processus : le pool les démarre tous (initializer compris)
+        await asyncio.gather(*(
+            boucle.run_in_executor(executeur, _rien)
+            for _ in range(self.processus)
+        ))
+
+    def fermer(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+# ========================================
+# 🗃️ CACHE
+# ========================================
+
+class CacheGraphiques:
+    """
+    PNG déjà rendus, adressés par l'empreinte (SHA-256) du nom du rendu, de
+    la version des données et des paramètres : une empreinte désigne toujours
+    la même image, une nouvelle version produit simplement d'autres clés.
+
+    Les `taille` images les plus récemment utilisées restent en mémoire ;
+    avec `dossier`, elles sont aussi écrites sur disque (même borne, les plus
+    anciennes sont supprimées) et survivent à un redémarrage.
+    """
+
+    def __init__(self, taille=16, dossier=None):
+        self.taille = taille
+        self.dossier = dossier
+        self.succes = 0
+        self.rendus = 0
+        self._images = OrderedDict()
+        self._en_cours = {}  # clé → tâche de production partagée
+
+    @staticmethod
+    def empreinte(nom, version, parametres=None):
+        contenu = json.dumps([nom, version, parametres or {}], sort_keys=True)
+        return hashlib.sha256(contenu.encode('utf-8')).hexdigest()
+
+    async def obtenir(self, cle, produire):
+        """PNG de `cle` ; `produire` (coroutine sans argument) n'est appelée qu'en cas d'absence"""
+        image = self._images.get(cle)
+        if image is not None:
+            self._images.move_to_end(cle)
+            self.succes += 1
+            return image
+
+        # Plusieurs vues simultanées de la même clé partagent un seul rendu
+        tache = self._en_cours.get(cle)
+        if tache is None:
+            tache = asyncio.ensure_future(self._produire(cle, produire))
+            self._en_cours[cle] = tache
+            tache.add_done_callback(lambda _: self._en_cours.pop(cle, None))
+        return await asyncio.shield(tache)
+
+    async def _produire(self, cle, produire):
+        image = None
+        if self.dossier:
+            image = await asyncio.to_thread(self._lire_disque, cle)
+        if image is None:
+            image = await produire()
+            self.rendus += 1
+            if self.dossier:
+                await asyncio.to_thread(self._ecrire_disque, cle, image)
+        else:
+            self.succes += 1
+        self._memoriser(cle, image)
+        return image
+
+    def _memoriser(self, cle, image):
+        self._images[cle] = image
+        self._images.move_to_end(cle)
+        while len(self._images) > self.taille:
+            self._images.popitem(last=False)
+
+    def invalider(self):
+        """Oublie les images en mémoire (celles du disque ne seront plus demandées)"""
+        self._images.clear()
+
+    # ========================================
+    # 💾 DISQUE (hors de la boucle)
+    # ========================================
+
+    def _chemin(self, cle):
+        return os.path.join(self.dossier, f"{cle}.png")
+
+    def _lire_disque(self, cle):
+        try:
+            with open(self._chemin(cle), 'rb') as f:
+                image = f.read()
+        except FileNotFoundError:
+            return None
+        os.utime(self._chemin(cle))  # Date de modification = dernier usage
+        return image
+
+    def _ecrire_disque(self, cle, image):
+        os.makedirs(self.dossier, exist_ok=True)
+        temporaire = f"{self._chemin(cle)}.tmp"
+        with open(temporaire, 'wb') as f:
+            f.write(image)
+        os.replace(temporaire, self._chemin(cle))
+
+        fichiers = [e for e in os.scandir(self.dossier) if e.name.endswith(".png")]
+        if len(fichiers) > self.taille:
+            fichiers.sort(key=lambda e: e.stat().st_mtime)
+            for entree in fichiers[:len(fichiers) - self.taille]:
+                try:
+                    os.remove(entree.path)
+                except FileNotFoundError:
+                    pass
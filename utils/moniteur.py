@@ -0,0 +1,179 @@
+"""
+Surveillance de la boucle d'événements : latence continue et détection des blocages
+"""
+import asyncio
+import os
+import sys
+import sysconfig
+import threading
+import time
+from collections import defaultdict, deque
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _dossiers_exclus():
+    """
+    Dossiers de l'interpréteur et des paquets installés (ex : un .venv dans le
+    dépôt), sauf ceux qui contiennent le dépôt lui-même (ex : sys.prefix = /usr)
+    """
+    dossiers = {sys.prefix, sys.base_prefix, sys.exec_prefix, *sysconfig.get_paths().values()}
+    exclus = []
+    for dossier in filter(None, dossiers):
+        dossier = os.path.abspath(dossier)
+        if os.path.commonpath([dossier, RACINE]) != dossier:
+            exclus.append(os.path.join(dossier, ""))
+    return tuple(exclus)
+
+
+EXCLUS = _dossiers_exclus()
+PAQUETS = {"site-packages", "dist-packages"}
+
+
+def code_du_bot(fichier):
+    """True si le fichier fait partie du dépôt (et non d'une dépendance installée dedans)"""
+    return (
+        fichier.startswith(os.path.join(RACINE, ""))
+        and not fichier.startswith(EXCLUS)
+        and PAQUETS.isdisjoint(fichier.split(os.sep))
+    )
+
+
+def percentile(valeurs, p):
+    """Percentile p (0-100) d'une liste de valeurs, par rang le plus proche"""
+    if not valeurs:
+        return 0.0
+    triees = sorted(valeurs)
+    index = min(len(triees) - 1, max(0, round(p / 100 * len(triees)) - 1))
+    return triees[index]
+
+
+def _nom_frame(frame):
+    code = frame.f_code
+    return getattr(code, "co_qualname", code.co_name)
+
+
+def fonctions_du_bot(frame):
+    """
+    Remonte la pile d'un thread et garde les fonctions du bot (cogs/, utils/...).
+    Retourne (point d'entrée, fonction la plus profonde), ex :
+    ("Budget.budget_voir", "Budget.generer_graphique").
+    """
+    noms = []
+    while frame is not None:
+        fichier = os.path.abspath(frame.f_code.co_filename)
+        # Le <module> de bot.py (asyncio.run) est au fond de toutes les piles
+        if (code_du_bot(fichier) and fichier != os.path.abspath(__file__)
+                and frame.f_code.co_name != "<module>"):
+            noms.append(_nom_frame(frame))
+        frame = frame.f_back
+    if not noms:
+        return None
+    return noms[-1], noms[0]
+
+
+class MoniteurBoucle:
+    """
+    Une sonde asyncio mesure en continu le retard de réveil de la boucle (lag).
+    Un thread de garde vérifie que la sonde progresse : si la boucle est bloquée
+    plus de `seuil` secondes, il capture la pile du thread de la boucle pour
+    nommer le cog et la fonction responsables.
+    """
+
+    def __init__(self, seuil=0.2, intervalle=0.1, periode_rapport=300, historique=288):
+        self.seuil = seuil
+        self.intervalle = intervalle
+        self.periode_rapport = periode_rapport
+
+        self.echantillons = []
+        self.rapports = deque(maxlen=historique)  # (horodatage, p50, p99, max)
+        self.blocages = defaultdict(lambda: {"nombre": 0, "total": 0.0, "max": 0.0})
+
+        self._verrou = threading.Lock()
+        self._battement = time.monotonic()
+        self._capture = None
+        self._thread_boucle = None
+        self._arret = threading.Event()
+        self._taches = []
+        self._garde = None
+
+    def demarrer(self):
+        """Démarre la sonde et le thread de garde (depuis la boucle)"""
+        self._thread_boucle = threading.get_ident()
+        self._battement = time.monotonic()
+        self._taches = [
+            asyncio.create_task(self._sonde()),
+            asyncio.create_task(self._rapport_periodique())
+        ]
+        self._garde = threading.Thread(target=self._surveiller, name="moniteur-boucle", daemon=True)
+        self._garde.start()
+
+    def arreter(self):
+        self._arret.set()
+        for tache in self._taches:
+            tache.cancel()
+
+    async def _sonde(self):
+        boucle = asyncio.get_running_loop()
+        while True:
+            debut = boucle.time()
+            await asyncio.sleep(self.intervalle)
+            retard = max(boucle.time() - debut - self.intervalle, 0.0)
+
+            with self._verrou:
+                self._battement = time.monotonic()
+                capture, self._capture = self._capture, None
+            self.echantillons.append(retard)
+
+            if retard >= self.seuil:
+                self._signaler(retard, capture)
+
+    def _surveiller(self):
+        """Thread de garde : capture la pile de la boucle pendant un blocage"""
+        while not self._arret.wait(self.seuil / 4):
+            with self._verrou:
+                bloquee = time.monotonic() - self._battement - self.intervalle > self.seuil
+                if not bloquee or self._capture is not None:
+                    continue
+            frame = sys._current_frames().get(self._thread_boucle)
+            capture = fonctions_du_bot(frame) if frame is not None else None
+            with self._verrou:
+                self._capture = capture or ("?", "?")
+
+    def _signaler(self, retard, capture):
+        if capture and capture != ("?", "?"):
+            entree, fonction = capture
+            nom = entree if entree == fonction else f"{entree} → {fonction}"
+        else:
+            nom = "inconnu (hors code du bot)"
+
+        stats = self.blocages[nom]
+        stats["nombre"] += 1
+        stats["total"] += retard
+        stats["max"] = max(stats["max"], retard)
+        print(f"🐢 Boucle bloquée {retard * 1000:.0f} ms : {nom}")
+
+    async def _rapport_periodique(self):
+        while True:
+            await asyncio.sleep(self.periode_rapport)
+            print(self.rapport())
+
+    def rapport(self):
+        """Résume la période écoulée (p50/p99 du lag) et les pires blocages"""
+        echantillons, self.echantillons = self.echantillons, []
+        p50 = percentile(echantillons, 50)
+        p99 = percentile(echantillons, 99)
+        maximum = max(echantillons, default=0.0)
+        self.rapports.append((time.time(), p50, p99, maximum))
+
+        lignes = [
+            f"⏱️ Latence boucle ({len(echantillons)} mesures) : "
+            f"p50 {p50 * 1000:.1f} ms • p99 {p99 * 1000:.1f} ms • max {maximum * 1000:.1f} ms"
+        ]
+        pires = sorted(self.blocages.items(), key=lambda x: x[1]["total"], reverse=True)[:5]
+        for nom, stats in pires:
+            lignes.append(
+                f"  🐢 {nom} : {stats['nombre']} blocage(s), "
+                f"total {stats['total'] * 1000:.0f} ms, max {stats['max'] * 1000:.0f} ms"
+            )
+        return "\n".join(lignes)
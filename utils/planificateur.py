@@ -0,0 +1,97 @@
+"""
+Planificateur d'échéances : un tas trié par date, une tâche qui dort jusqu'à la prochaine
+"""
+import asyncio
+import heapq
+import itertools
+from datetime import datetime
+
+
+class Planificateur:
+    """
+    Chaque clé (ex : l'id d'une réunion) possède un jeu d'échéances
+    (date, événement). Replanifier ou annuler une clé ne fouille pas le tas :
+    la clé change de génération et ses anciennes entrées sont ignorées quand
+    elles remontent. Un passage ne coûte donc que le nombre d'échéances dues.
+
+    `traiter` est une coroutine appelée avec la liste des (clé, événement)
+    échus lors d'un même réveil.
+    """
+
+    def __init__(self, traiter, attente_max=60):
+        self.traiter = traiter
+        # Les dates sont en heure locale : on se recale au moins une fois par
+        # minute pour suivre un changement d'heure de l'horloge système
+        self.attente_max = attente_max
+        self._tas = []  # (date, ordre, clé, génération, événement)
+        self._generations = {}
+        self._ordre = itertools.count()
+        self._reveil = asyncio.Event()
+
+    def planifier(self, cle, echeances):
+        """Remplace les échéances d'une clé par `echeances` [(date, événement)]"""
+        generation = self._generations.get(cle, 0) + 1
+        self._generations[cle] = generation
+        for date, evenement in echeances:
+            heapq.heappush(self._tas, (date, next(self._ordre), cle, generation, evenement))
+        self._compacter()
+        self._reveil.set()
+
+    def annuler(self, cle):
+        """Oublie toutes les échéances d'une clé"""
+        if self._generations.pop(cle, None) is not None:
+            self._compacter()
+
+    def _valide(self, entree):
+        return self._generations.get(entree[2]) == entree[3]
+
+    def _compacter(self):
+        # Les entrées périmées restent dans le tas jusqu'à leur sortie ;
+        # s'il en contient plus de la moitié, on le reconstruit
+        if len(self._tas) > 64 and len(self._tas) > 4 * max(len(self._generations), 1):
+            self._tas = [entree for entree in self._tas if self._valide(entree)]
+            heapq.heapify(self._tas)
+
+    def prochaine(self):
+        """Date de la prochaine échéance valide (None si aucune)"""
+        while self._tas and not self._valide(self._tas[0]):
+            heapq.heappop(self._tas)
+        return self._tas[0][0] if self._tas else None
+
+    def echues(self, maintenant=None):
+        """Retire du tas et retourne les (clé, événement) dont la date est passée"""
+        maintenant = maintenant or datetime.now()
+        dues = []
+        while self._tas and self._tas[0][0] <= maintenant:
+            entree = heapq.heappop(self._tas)
+            if self._valide(entree):
+                dues.append((entree[2], entree[4]))
+        return dues
+
+    async def passage(self):
+        """Traite les échéances dues maintenant (retourne leur nombre)"""
+        dues = self.echues()
+        if dues:
+            await self.traiter(dues)
+        return len(dues)
+
+    async def tourner(self):
+        """Boucle principale : traite ce qui est dû puis dort jusqu'à la suite"""
+        while True:
+            self._reveil.clear()
+            try:
+                await self.passage()
+            except Exception as e:
+                print(f"❌ Erreur planificateur: {e}")
+
+            prochaine = self.prochaine()
+            attente = self.attente_max
+            if prochaine is not None:
+                attente = min(max((prochaine - datetime.now()).total_seconds(), 0), attente)
+            try:
+                await asyncio.wait_for(self._reveil.wait(), timeout=attente)
+            except asyncio.TimeoutError:
+                pass
+
+    def __len__(self):
+        return len(self._generations)
@@ -0,0 +1,265 @@
+"""
+Modèle des réunions en mémoire et index de recherche
+"""
+import calendar
+from datetime import datetime, timedelta
+
+RAPPELS = ("rappel_30min_envoye", "rappel_5min_envoye", "rappel_debut_envoye")
+
+FREQUENCES = {
+    "quotidienne": "Chaque jour",
+    "hebdomadaire": "Chaque semaine",
+    "mensuelle": "Chaque mois",
+}
+
+# Une occurrence est close 24h après son début, ou 1h avant la suivante si elle est plus proche
+DUREE_OCCURRENCE = timedelta(hours=24)
+MARGE_OCCURRENCE = timedelta(hours=1)
+
+
+def ajouter_mois(date, nombre):
+    """Même jour `nombre` mois plus tard (ramené au dernier jour du mois si besoin)"""
+    mois = date.month - 1 + nombre
+    annee = date.year + mois // 12
+    mois = mois % 12 + 1
+    jour = min(date.day, calendar.monthrange(annee, mois)[1])
+    return date.replace(year=annee, month=mois, day=jour)
+
+
+class Reunion:
+    """
+    Une réunion avec sa date déjà convertie et ses participants en ensembles.
+    `to_dict()` redonne exactement le format stocké (listes, date ISO) ; les
+    clés inconnues du modèle sont conservées telles quelles dans `extra`.
+
+    Une réunion récurrente reste un seul objet : sa règle (`recurrence`) et
+    l'occurrence en cours. `date`, les réponses et les rappels concernent
+    cette occurrence ; `avancer()` passe à la suivante en repartant de zéro.
+    """
+    __slots__ = (
+        "id", "message_id", "guild_id", "channel_id",
+        "organisateur_id", "organisateur_name",
+        "date", "titre", "sujet",
+        "invites", "confirmes", "absents",
+        "rappel_30min_envoye", "rappel_5min_envoye", "rappel_debut_envoye",
+        "created_at", "recurrence", "occurrence",
+        "salon_vocal_id", "presences", "extra"
+    )
+
+    def __init__(self, id, message_id, guild_id, channel_id, organisateur_id, organisateur_name,
+                 date, titre, sujet, invites=(), confirmes=(), absents=(), created_at=None,
+                 recurrence=None, occurrence=0, salon_vocal_id=None):
+        self.id = id
+        self.message_id = message_id
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.organisateur_id = organisateur_id
+        self.organisateur_name = organisateur_name
+        self.date = date
+        self.titre = titre
+        self.sujet = sujet
+        self.invites = set(invites)
+        self.confirmes = set(confirmes)
+        self.absents = set(absents)
+        self.rappel_30min_envoye = False
+        self.rappel_5min_envoye = False
+        self.rappel_debut_envoye = False
+        self.created_at = created_at or datetime.now().isoformat()
+        # {"frequence", "debut", "fin" (datetime ou None), "nombre" (int ou None)}
+        self.recurrence = recurrence
+        self.occurrence = occurrence
+        # Salon vocal suivi : membre → secondes passées dans le salon pendant la réunion
+        self.salon_vocal_id = salon_vocal_id
+        self.presences = {}
+        self.extra = {}
+
+    @classmethod
+    def from_dict(cls, donnees):
+        donnees = dict(donnees)
+        reunion = cls(
+            id=donnees.pop('id'),
+            message_id=donnees.pop('message_id'),
+            guild_id=donnees.pop('guild_id'),
+            channel_id=donnees.pop('channel_id'),
+            organisateur_id=donnees.pop('organisateur_id'),
+            organisateur_name=donnees.pop('organisateur_name'),
+            date=datetime.fromisoformat(donnees.pop('date')),
+            titre=donnees.pop('titre'),
+            sujet=donnees.pop('sujet'),
+            invites=donnees.pop('participants_invites', ()),
+            confirmes=donnees.pop('participants_confirmes', ()),
+            absents=donnees.pop('participants_absents', ()),
+            created_at=donnees.pop('created_at', None),
+            occurrence=donnees.pop('occurrence', 0),
+            salon_vocal_id=donnees.pop('salon_vocal_id', None)
+        )
+        reunion.presences = {
+            int(membre): minutes * 60
+            for membre, minutes in donnees.pop('presences_minutes', {}).items()
+        }
+        recurrence = donnees.pop('recurrence', None)
+        if recurrence:
+            reunion.recurrence = {
+                'frequence': recurrence['frequence'],
+                'debut': datetime.fromisoformat(recurrence['debut']),
+                'fin': datetime.fromisoformat(recurrence['fin']) if recurrence.get('fin') else None,
+                'nombre': recurrence.get('nombre')
+            }
+        for rappel in RAPPELS:
+            setattr(reunion, rappel, bool(donnees.pop(rappel, False)))
+        reunion.extra = donnees
+        return reunion
+
+    def to_dict(self):
+        donnees = {
+            'id': self.id,
+            'message_id': self.message_id,
+            'guild_id': self.guild_id,
+            'channel_id': self.channel_id,
+            'organisateur_id': self.organisateur_id,
+            'organisateur_name': self.organisateur_name,
+            'date': self.date.isoformat(),
+            'titre': self.titre,
+            'sujet': self.sujet,
+            'participants_invites': sorted(self.invites),
+            'participants_confirmes': sorted(self.confirmes),
+            'participants_absents': sorted(self.absents),
+            'rappel_30min_envoye': self.rappel_30min_envoye,
+            'rappel_5min_envoye': self.rappel_5min_envoye,
+            'rappel_debut_envoye': self.rappel_debut_envoye,
+            'created_at': self.created_at
+        }
+        if self.recurrence:
+            # Clés absentes pour une réunion simple : le format stocké ne change pas
+            donnees['recurrence'] = {
+                'frequence': self.recurrence['frequence'],
+                'debut': self.recurrence['debut'].isoformat(),
+                'fin': self.recurrence['fin'].isoformat() if self.recurrence['fin'] else None,
+                'nombre': self.recurrence['nombre']
+            }
+            donnees['occurrence'] = self.occurrence
+        if self.salon_vocal_id is not None:
+            donnees['salon_vocal_id'] = self.salon_vocal_id
+            donnees['presences_minutes'] = {
+                str(membre): round(secondes / 60, 1)
+                for membre, secondes in self.presences.items()
+            }
+        donnees.update(self.extra)
+        return donnees
+
+    def ajouter_presence(self, membre_id, secondes):
+        self.presences[membre_id] = self.presences.get(membre_id, 0.0) + secondes
+
+    # ========================================
+    # 🔁 RÉCURRENCE
+    # ========================================
+
+    def date_occurrence(self, numero):
+        """Date de la n-ième occurrence (0 = la première) d'une série"""
+        frequence = self.recurrence['frequence']
+        debut = self.recurrence['debut']
+        if frequence == "quotidienne":
+            return debut + timedelta(days=numero)
+        if frequence == "hebdomadaire":
+            return debut + timedelta(weeks=numero)
+        return ajouter_mois(debut, numero)
+
+    def occurrence_suivante(self):
+        """Date de l'occurrence suivante, None si c'est la dernière (ou une réunion simple)"""
+        if not self.recurrence:
+            return None
+        numero = self.occurrence + 1
+        nombre = self.recurrence['nombre']
+        if nombre is not None and numero >= nombre:
+            return None
+        date = self.date_occurrence(numero)
+        fin = self.recurrence['fin']
+        if fin is not None and date > fin:
+            return None
+        return date
+
+    def fin_occurrence(self):
+        """Moment où l'occurrence en cours est close (archivée)"""
+        fin = self.date + DUREE_OCCURRENCE
+        suivante = self.occurrence_suivante()
+        if suivante is not None:
+            fin = min(fin, suivante - MARGE_OCCURRENCE)
+        return fin
+
+    def avancer(self):
+        """Passe à l'occurrence suivante ; False si la série est terminée"""
+        suivante = self.occurrence_suivante()
+        if suivante is None:
+            return False
+        self.occurrence += 1
+        self.date = suivante
+        self.confirmes = set()
+        self.absents = set()
+        self.presences = {}
+        for rappel in RAPPELS:
+            setattr(self, rappel, False)
+        return True
+
+    def confirmer(self, user_id):
+        """✅ : passe le membre chez les confirmés ; True si c'est nouveau"""
+        self.absents.discard(user_id)
+        if user_id in self.confirmes:
+            return False
+        self.confirmes.add(user_id)
+        return True
+
+    def declarer_absent(self, user_id):
+        """❌ : passe le membre chez les absents ; True si c'est nouveau"""
+        self.confirmes.discard(user_id)
+        if user_id in self.absents:
+            return False
+        self.absents.add(user_id)
+        return True
+
+
+class RegistreReunions:
+    """Réunions indexées par id, par message d'annonce et par serveur"""
+
+    def __init__(self, reunions=()):
+        self.par_id = {}
+        self.par_message = {}
+        self.par_serveur = {}
+        self.dernier_id = 0
+        for reunion in reunions:
+            self.ajouter(reunion)
+
+    def ajouter(self, reunion):
+        self.par_id[reunion.id] = reunion
+        self.dernier_id = max(self.dernier_id, reunion.id)
+        self.par_message[reunion.message_id] = reunion
+        self.par_serveur.setdefault(reunion.guild_id, {})[reunion.id] = reunion
+
+    def retirer(self, reunion):
+        self.par_id.pop(reunion.id, None)
+        self.par_message.pop(reunion.message_id, None)
+        du_serveur = self.par_serveur.get(reunion.guild_id)
+        if du_serveur is not None:
+            du_serveur.pop(reunion.id, None)
+            if not du_serveur:
+                del self.par_serveur[reunion.guild_id]
+
+    def get(self, reunion_id):
+        return self.par_id.get(reunion_id)
+
+    def par_message_id(self, message_id):
+        return self.par_message.get(message_id)
+
+    def du_serveur(self, guild_id):
+        return list(self.par_serveur.get(guild_id, {}).values())
+
+    def prochain_id(self):
+        return self.dernier_id + 1
+
+    def __iter__(self):
+        return iter(list(self.par_id.values()))
+
+    def __len__(self):
+        return len(self.par_id)
+
+    def __contains__(self, reunion):
+        return self.par_id.get(reunion.id) is reunion
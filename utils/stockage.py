@@ -0,0 +1,405 @@
+"""
+Stockage SQLite partagé par les cogs (mode WAL)
+"""
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+
+REQUETE_SET = (
+    "INSERT INTO elements (collection, cle, valeur) VALUES (?, ?, ?) "
+    "ON CONFLICT(collection, cle) DO UPDATE SET valeur = excluded.valeur"
+)
+
+
+def instantane(valeur):
+    """Copie rapide d'un arbre dict/list (les scalaires sont immuables)"""
+    if isinstance(valeur, dict):
+        return {cle: instantane(v) for cle, v in valeur.items()}
+    if isinstance(valeur, list):
+        return [instantane(v) for v in valeur]
+    return valeur
+
+
+class MesureBlocage:
+    """Temps passé sur la boucle d'événements par les écritures"""
+
+    def __init__(self):
+        self.nombre = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def ajouter(self, duree):
+        self.nombre += 1
+        self.total += duree
+        self.max = max(self.max, duree)
+
+    def resume(self):
+        if not self.nombre:
+            return "aucune écriture"
+        moyenne = self.total / self.nombre
+        return (
+            f"{self.nombre} opération(s), moy {moyenne * 1000:.3f} ms, "
+            f"max {self.max * 1000:.3f} ms, total {self.total * 1000:.1f} ms"
+        )
+
+
+def _signaler_erreur(futur):
+    erreur = futur.exception()
+    if erreur is not None:
+        print(f"❌ Erreur écriture base : {erreur}")
+
+
+class Stockage:
+    """
+    Base clé/valeur SQLite : chaque élément est une ligne (collection, clé, valeur JSON).
+    Modifier un élément ne réécrit que sa ligne, plus le document entier.
+
+    Les écritures « différées » (set_differe, delete_differe...) copient la valeur
+    sur la boucle puis l'encodent et l'écrivent dans un thread dédié. Ce thread
+    unique traite les lots dans l'ordre : un état récent n'est jamais écrasé par
+    un plus ancien.
+    """
+
+    def __init__(self, chemin="data/bot.db", ecriture_synchrone=False):
+        os.makedirs(os.path.dirname(chemin) or ".", exist_ok=True)
+        self.chemin = chemin
+        self._verrou = threading.RLock()
+        self._profondeur = 0
+        self._ferme = False
+
+        # Écritures différées : un seul thread, donc un ordre FIFO garanti.
+        # ecriture_synchrone=True les applique sur la boucle (mesure « avant »)
+        self.ecriture_synchrone = ecriture_synchrone
+        self._ecrivain = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stockage")
+        self._lot = None
+        self.blocage = MesureBlocage()
+
+        # Lectures sur la boucle, écritures différées sur leur propre connexion (WAL)
+        self.conn = self._connecter()
+        self._conn_ecriture = self._connecter()
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS elements (
+                collection TEXT NOT NULL,
+                cle TEXT NOT NULL,
+                valeur TEXT NOT NULL,
+                PRIMARY KEY (collection, cle)
+            )"""
+        )
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (cle TEXT PRIMARY KEY, valeur TEXT)")
+
+    def _connecter(self):
+        # isolation_level=None : autocommit, les transactions sont explicites
+        conn = sqlite3.connect(self.chemin, isolation_level=None, check_same_thread=False, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def collection(self, nom):
+        """Retourne l'accès à une collection (équivalent d'un ancien fichier JSON)"""
+        return Collection(self, nom)
+
+    @contextmanager
+    def transaction(self):
+        """Regroupe plusieurs écritures dans un seul commit (imbriquable)"""
+        with self._verrou:
+            if self._profondeur == 0:
+                self.conn.execute("BEGIN IMMEDIATE")
+            self._profondeur += 1
+            try:
+                yield self
+            except BaseException:
+                self._profondeur -= 1
+                if self._profondeur == 0:
+                    self.conn.execute("ROLLBACK")
+                raise
+            else:
+                self._profondeur -= 1
+                if self._profondeur == 0:
+                    self.conn.execute("COMMIT")
+
+    def executer(self, requete, parametres=()):
+        """Exécute une requête sous le verrou de la connexion"""
+        with self._verrou:
+            return self.conn.execute(requete, parametres)
+
+    def executer_plusieurs(self, requete, lignes):
+        """Exécute une requête pour chaque ligne sous le verrou de la connexion"""
+        with self._verrou:
+            return self.conn.executemany(requete, lignes)
+
+    # ========================================
+    # ✍️ ÉCRITURES DIFFÉRÉES
+    # ========================================
+
+    def differer(self, type_operation, collection, cle=None, valeur=None):
+        """Copie la valeur et programme l'opération dans le thread d'écriture"""
+        debut = time.perf_counter()
+        operation = (type_operation, collection, None if cle is None else str(cle), instantane(valeur))
+
+        if self._lot is not None:
+            self._lot.append(operation)
+            futur = None
+        else:
+            futur = self._soumettre([operation])
+
+        self.blocage.ajouter(time.perf_counter() - debut)
+        return futur
+
+    @contextmanager
+    def lot(self):
+        """Regroupe les écritures différées du bloc dans un seul commit"""
+        if self._lot is not None:
+            yield self
+            return
+
+        self._lot = []
+        try:
+            yield self
+            operations = self._lot
+        finally:
+            self._lot = None
+
+        if operations:
+            debut = time.perf_counter()
+            self._soumettre(operations)
+            self.blocage.ajouter(time.perf_counter() - debut)
+
+    def soumettre(self, fonction, *args):
+        """
+        Exécute une écriture quelconque dans le thread d'écriture, à la suite
+        des autres. Retourne toujours un Future (déjà terminé en mode synchrone).
+        """
+        if self.ecriture_synchrone:
+            futur = Future()
+            try:
+                futur.set_result(fonction(*args))
+            except Exception as e:
+                futur.set_exception(e)
+            futur.add_done_callback(_signaler_erreur)
+            return futur
+        futur = self._ecrivain.submit(fonction, *args)
+        futur.add_done_callback(_signaler_erreur)
+        return futur
+
+    async def synchroniser(self):
+        """Attend que toutes les écritures déjà programmées soient validées"""
+        if self.ecriture_synchrone:
+            return
+        # Le thread d'écriture est FIFO : une tâche vide passe après les précédentes
+        await asyncio.wrap_future(self._ecrivain.submit(lambda: None))
+
+    def _soumettre(self, operations):
+        return self.soumettre(self._appliquer, operations)
+
+    def _appliquer(self, operations):
+        """Encode et écrit un lot d'opérations dans un seul commit (thread d'écriture)"""
+        conn = self._conn_ecriture
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for type_operation, collection, cle, valeur in operations:
+                if type_operation == "set":
+                    conn.execute(REQUETE_SET, (collection, cle, json.dumps(valeur, ensure_ascii=False)))
+                elif type_operation == "delete":
+                    conn.execute("DELETE FROM elements WHERE collection = ? AND cle = ?", (collection, cle))
+                elif type_operation == "clear":
+                    conn.execute("DELETE FROM elements WHERE collection = ?", (collection,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def rapport_blocage(self):
+        mode = "synchrone" if self.ecriture_synchrone else "thread d'écriture"
+        return f"[{mode}] {self.blocage.resume()}"
+
+    def get_meta(self, cle, defaut=None):
+        ligne = self.executer("SELECT valeur FROM meta WHERE cle = ?", (cle,)).fetchone()
+        return ligne[0] if ligne else defaut
+
+    def set_meta(self, cle, valeur):
+        self.executer(
+            "INSERT INTO meta (cle, valeur) VALUES (?, ?) "
+            "ON CONFLICT(cle) DO UPDATE SET valeur = excluded.valeur",
+            (cle, valeur)
+        )
+
+    def close(self):
+        """Termine les écritures en attente puis ferme la base (après un checkpoint du WAL)"""
+        with self._verrou:
+            if self._ferme:
+                return
+            self._ferme = True
+            self._ecrivain.shutdown(wait=True)
+            try:
+                self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            finally:
+                self._conn_ecriture.close()
+                self.conn.close()
+
+
+class Collection:
+    """Ensemble d'éléments d'une même collection, adressés par clé"""
+
+    def __init__(self, stockage, nom):
+        self.stockage = stockage
+        self.nom = nom
+
+    def get(self, cle, defaut=None):
+        ligne = self.stockage.executer(
+            "SELECT valeur FROM elements WHERE collection = ? AND cle = ?",
+            (self.nom, str(cle))
+        ).fetchone()
+        return json.loads(ligne[0]) if ligne else defaut
+
+    def set(self, cle, valeur):
+        """Insère ou remplace un élément (l'ordre d'insertion est conservé)"""
+        self.stockage.executer(REQUETE_SET, (self.nom, str(cle), json.dumps(valeur, ensure_ascii=False)))
+
+    def set_many(self, elements):
+        """Insère ou remplace plusieurs éléments en une seule transaction"""
+        lignes = [
+            (self.nom, str(cle), json.dumps(valeur, ensure_ascii=False))
+            for cle, valeur in elements
+        ]
+        if not lignes:
+            return
+        with self.stockage.transaction():
+            self.stockage.executer_plusieurs(REQUETE_SET, lignes)
+
+    def delete(self, cle):
+        self.stockage.executer(
+            "DELETE FROM elements WHERE collection = ? AND cle = ?",
+            (self.nom, str(cle))
+        )
+
+    def clear(self):
+        self.stockage.executer("DELETE FROM elements WHERE collection = ?", (self.nom,))
+
+    def set_differe(self, cle, valeur):
+        """Comme set, mais l'encodage et l'écriture se font hors de la boucle"""
+        return self.stockage.differer("set", self.nom, cle, valeur)
+
+    def delete_differe(self, cle):
+        return self.stockage.differer("delete", self.nom, cle)
+
+    def clear_differe(self):
+        return self.stockage.differer("clear", self.nom)
+
+    def items(self):
+        """Liste des (clé, valeur) dans l'ordre d'insertion"""
+        lignes = self.stockage.executer(
+            "SELECT cle, valeur FROM elements WHERE collection = ? ORDER BY rowid",
+            (self.nom,)
+        ).fetchall()
+        return [(cle, json.loads(valeur)) for cle, valeur in lignes]
+
+    def values(self):
+        return [valeur for _, valeur in self.items()]
+
+    def items_apres(self, cle):
+        """
+        (clé, valeur) dont la clé suit `cle`, dans l'ordre des clés (parcours de
+        la clé primaire : des clés de même longueur se comparent comme des nombres)
+        """
+        lignes = self.stockage.executer(
+            "SELECT cle, valeur FROM elements WHERE collection = ? AND cle > ? ORDER BY cle",
+            (self.nom, str(cle))
+        ).fetchall()
+        return [(cle, json.loads(valeur)) for cle, valeur in lignes]
+
+    def load(self):
+        """Charge toute la collection sous forme de dictionnaire"""
+        return dict(self.items())
+
+    def __len__(self):
+        return self.stockage.executer(
+            "SELECT COUNT(*) FROM elements WHERE collection = ?", (self.nom,)
+        ).fetchone()[0]
+
+    def __contains__(self, cle):
+        return self.stockage.executer(
+            "SELECT 1 FROM elements WHERE collection = ? AND cle = ?",
+            (self.nom, str(cle))
+        ).fetchone() is not None
+
+
+# ========================================
+# 📥 IMPORT DES ANCIENS FICHIERS JSON
+# ========================================
+
+def _importer_reunions(stockage, donnees):
+    collection = stockage.collection("reunions")
+    ids = set()
+    for reunion in donnees:
+        # Les anciens IDs (len + 1) pouvaient se répéter après une annulation
+        if reunion.get('id') in ids:
+            reunion['id'] = max(ids) + 1
+        ids.add(reunion['id'])
+        collection.set(reunion['id'], reunion)
+
+
+def _importer_statistiques(stockage, donnees):
+    stockage.collection("statistiques").set(
+        "serveur", donnees.get("serveur", {"messages": 0, "commandes": 0})
+    )
+    stockage.collection("statistiques_membres").set_many(donnees.get("membres", {}).items())
+
+
+def _importer_dictionnaire(nom):
+    def importer(stockage, donnees):
+        stockage.collection(nom).set_many(donnees.items())
+    return importer
+
+
+# Fichier → fonction d'import. Les modules dont le format en base a sa propre
+# logique (utils/budget.py) y ajoutent leur entrée à l'import.
+IMPORTS_JSON = {
+    "reunions.json": _importer_reunions,
+    "statistiques.json": _importer_statistiques,
+    "calendrier.json": _importer_dictionnaire("calendrier"),
+    "personnages.json": _importer_dictionnaire("personnages"),
+    "organigramme.json": _importer_dictionnaire("organigramme"),
+}
+
+
+def importer_json(stockage, dossier="data"):
+    """
+    Importe une seule fois les anciens fichiers data/*.json dans la base.
+    Les fichiers sont conservés tels quels ; l'import est noté dans la table meta.
+    """
+    importes = []
+    for fichier, importer in IMPORTS_JSON.items():
+        chemin = os.path.join(dossier, fichier)
+        cle_meta = f"import:{fichier}"
+        if not os.path.exists(chemin) or stockage.get_meta(cle_meta):
+            continue
+
+        try:
+            with open(chemin, 'r', encoding='utf-8') as f:
+                donnees = json.load(f)
+            with stockage.transaction():
+                importer(stockage, donnees)
+                stockage.set_meta(cle_meta, datetime.now().isoformat())
+            importes.append(fichier)
+        except Exception as e:
+            print(f"❌ Erreur import {fichier} : {e}")
+
+    return importes
+
+
+if __name__ == "__main__":
+    # En script, ce module est __main__ : on passe par utils.stockage, où les
+    # modules métier enregistrent leurs imports
+    import utils.budget  # noqa: F401
+    from utils.stockage import Stockage, importer_json
+
+    base = Stockage()
+    fichiers = importer_json(base)
+    print(f"📥 {len(fichiers)} fichier(s) importé(s) : {', '.join(fichiers) or 'aucun'}")
+    base.close()